@@ -1,18 +1,32 @@
 from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
-from pymongo import MongoClient, DESCENDING
-from bson import ObjectId
-from datetime import datetime, timedelta
+from pymongo import MongoClient, DESCENDING, ReturnDocument, UpdateOne, monitoring
+from bson import ObjectId, Binary
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 import os
-from io import BytesIO
+import atexit
+import threading
+import time
+import hashlib
+import io
+import csv
+import json
+import tempfile
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+import unicodedata
 # Imports moved to function to optimize startup
 # from openpyxl.styles import Font, PatternFill, Alignment
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+from urllib.parse import quote, quote_plus
+from werkzeug.wsgi import FileWrapper
+from werkzeug.exceptions import HTTPException
 import jwt
 from functools import wraps
 import gridfs
-from pymongo.errors import ServerSelectionTimeoutError, OperationFailure
+from pymongo.errors import ServerSelectionTimeoutError, OperationFailure, BulkWriteError, DuplicateKeyError
 
 # Load environment variables
 load_dotenv()
@@ -31,34 +45,141 @@ ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 
+# MongoDB connection pool settings (one client per process, shared by all threads)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+_mongo_client = None
+_mongo_lock = threading.Lock()
+_db_stats_lock = threading.Lock()
+_db_stats = {
+    "clients_created": 0,
+    "connections_created": 0,
+    "connections_closed": 0,
+    "connections_in_use": 0
+}
+
+def _bump_db_stat(name, amount=1):
+    with _db_stats_lock:
+        _db_stats[name] += amount
+
+class _PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts pool connections so health checks can report socket churn"""
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): pass
+
+    def connection_created(self, event):
+        _bump_db_stat("connections_created")
+
+    def connection_closed(self, event):
+        _bump_db_stat("connections_closed")
+
+    def connection_checked_out(self, event):
+        _bump_db_stat("connections_in_use")
+
+    def connection_checked_in(self, event):
+        _bump_db_stat("connections_in_use", -1)
+
+def _build_connection_string():
+    MONGO_USER = os.getenv("MONGO_USER", "JobPortal")
+    MONGO_PASSWORD = os.getenv("MONGO_PASSWORD", "")
+    # Handle empty password specifically to avoid invalid URI
+    if not MONGO_PASSWORD: 
+         # Fallback or error - For now let it try, it might be localhost with no auth
+         pass 
+
+    username = quote_plus(MONGO_USER)
+    password = quote_plus(MONGO_PASSWORD)
+    return f"mongodb+srv://{username}:{password}@{MONGO_CLUSTER}/job_portal?retryWrites=true&w=majority"
+
 # Lazy DB Connection
 def get_db():
-    try:
-        MONGO_USER = os.getenv("MONGO_USER", "JobPortal")
-        MONGO_PASSWORD = os.getenv("MONGO_PASSWORD", "")
-        # Handle empty password specifically to avoid invalid URI
-        if not MONGO_PASSWORD: 
-             # Fallback or error - For now let it try, it might be localhost with no auth
-             pass 
-
-        username = quote_plus(MONGO_USER)
-        password = quote_plus(MONGO_PASSWORD)
-        
-        # Check if running in Vercel - DB Connection
-        # Use lazy connection
-        connection_string = f"mongodb+srv://{username}:{password}@{MONGO_CLUSTER}/job_portal?retryWrites=true&w=majority"
-        
-        client = MongoClient(connection_string, serverSelectionTimeoutMS=5000) # 5s timeout
+    """
+    Return the job_portal database backed by a single process-wide MongoClient.
+    The client is created on first use and reused by every request thread (and
+    by warm serverless invocations); it is rebuilt after a fork.
+    """
+    global _mongo_client
+    client = _mongo_client
+    if client is not None:
         return client['job_portal']
-    except Exception as e:
-        print(f"DB Connection Error: {e}")
-        raise e
+
+    with _mongo_lock:
+        if _mongo_client is None:
+            try:
+                _mongo_client = MongoClient(
+                    _build_connection_string(),
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                    event_listeners=[_PoolStatsListener()]
+                )
+                _bump_db_stat("clients_created")
+            except Exception as e:
+                print(f"DB Connection Error: {e}")
+                raise e
+        return _mongo_client['job_portal']
+
+def close_db():
+    """Close the shared MongoClient (called on interpreter shutdown)"""
+    global _mongo_client
+    with _mongo_lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+            _mongo_client = None
+
+def _reset_db_after_fork():
+    # MongoClient is not fork-safe: the child must open its own sockets,
+    # and its health stats start from zero rather than the parent's counts
+    global _mongo_client, _mongo_lock, _db_stats_lock
+    _mongo_client = None
+    _mongo_lock = threading.Lock()
+    _db_stats_lock = threading.Lock()
+    for name in _db_stats:
+        _db_stats[name] = 0
+
+def get_db_stats():
+    """Snapshot of client/connection counters for this process"""
+    with _db_stats_lock:
+        stats = dict(_db_stats)
+    stats["pool_max_size"] = MONGO_MAX_POOL_SIZE
+    stats["pool_min_size"] = MONGO_MIN_POOL_SIZE
+    stats["pool_max_idle_time_ms"] = MONGO_MAX_IDLE_TIME_MS
+    return stats
+
+atexit.register(close_db)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_db_after_fork)
 
 app.config['SECRET_KEY'] = SECRET_KEY
 
+# Upload limits: Werkzeug rejects any body above MAX_CONTENT_LENGTH before
+# parsing it; /api/apply additionally enforces the per-resume limit
+MAX_RESUME_SIZE_MB = int(os.getenv("MAX_RESUME_SIZE_MB", "5"))
+MAX_RESUME_SIZE = MAX_RESUME_SIZE_MB * 1024 * 1024
+APPLY_FORM_OVERHEAD = 64 * 1024  # room for the text fields of the form
+RESUME_CHUNK_SIZE = 255 * 1024  # GridFS default chunk size
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("MAX_CONTENT_LENGTH_MB", "16")) * 1024 * 1024
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({"error": "Request body is too large"}), 413
+
 
 
 # JWT Token decorator
+# Long-lived calendar feed tokens can only read the .ics feeds
+CALENDAR_TOKEN_SCOPE = "calendar"
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -78,6 +199,9 @@ def token_required(f):
         except jwt.InvalidTokenError:
             return jsonify({"error": "Invalid token"}), 401
         
+        if data.get('scope') == CALENDAR_TOKEN_SCOPE:
+            return jsonify({"error": "Invalid token"}), 401
+        
         return f(*args, **kwargs)
     
     return decorated
@@ -92,41 +216,209 @@ def serialize_doc(doc):
         doc['id'] = str(doc['_id'])
     return doc
 
+# ============ CACHING ============
+
+class TTLCache:
+    """
+    Bounded, thread-safe cache with per-entry TTL and LRU eviction.
+    Concurrent misses on the same key are coalesced so only one caller runs
+    the loader while the others wait for its result.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> threading.Event set when the load finishes
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_load(self, key, loader):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return loader()
+
+        while True:
+            with self._lock:
+                entry = self._data.get(key)
+                if entry and entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    waiter = self._inflight[key] = threading.Event()
+                    generation = self._generation
+                    self.misses += 1
+                    break
+                self.coalesced += 1
+
+            # Another thread is loading this key; re-check once it finishes
+            waiter.wait(timeout=30)
+
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter.set()
+            raise
+
+        with self._lock:
+            # Skip storing results that raced with an invalidation
+            if generation == self._generation:
+                self._data[key] = (time.monotonic() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+            self._inflight.pop(key, None)
+        waiter.set()
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions
+            }
+
+# Public job reads; cleared by the admin job routes. Other workers pick up
+# changes within JOBS_CACHE_TTL seconds.
+jobs_cache = TTLCache(
+    maxsize=int(os.getenv("JOBS_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("JOBS_CACHE_TTL", "30"))
+)
+
+# Browsers always revalidate (cheap 304); a CDN may serve its copy briefly
+JOBS_CACHE_CONTROL = os.getenv(
+    "JOBS_CACHE_CONTROL",
+    "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+)
+
+def render_json_entry(payload):
+    """Serialize once for the cache; the strong ETag is a hash of the body"""
+    if payload is None:
+        return None
+    body = app.json.dumps(payload).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
+
+def conditional_json_response(entry, cache_control=JOBS_CACHE_CONTROL):
+    """Send a cached (body, etag) pair, or 304 if the client already has it"""
+    body, etag = entry
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
 # ============ PUBLIC ROUTES (No Authentication) ============
 
-@app.route("/api/health", methods=["GET"])
-def health():
-    try:
+# Readiness probes reuse a recent ping instead of hitting the DB every time
+HEALTH_PING_TTL = float(os.getenv("HEALTH_PING_TTL", "5"))
 
-        db = get_db()
-        # Ping the database
-        db.command('ping')
+_ping_lock = threading.Lock()
+_last_ping = {"checked_at": 0.0}
+
+def ping_database(max_age=HEALTH_PING_TTL):
+    """
+    Ping MongoDB at most once per max_age seconds (per process).
+    Returns {"ok", "latency_ms", "error", "error_type", "checked_at"}.
+    """
+    with _ping_lock:
+        if time.monotonic() - _last_ping["checked_at"] < max_age:
+            return dict(_last_ping)
         
-        app_count = db['applications'].count_documents({})
-        job_count = db['jobs'].count_documents({})
-        resume_count = db.fs.files.count_documents({})
+        started = time.perf_counter()
+        result = {"ok": True, "error": None, "error_type": None}
+        try:
+            get_db().command('ping')
+        except Exception as e:
+            result.update(ok=False, error=str(e), error_type=type(e).__name__)
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["checked_at"] = time.monotonic()
         
-        return jsonify({
-            "status": "ok",
-            "message": "Backend is running",
-            "database": "connected",
-            "storage": "GridFS (MongoDB)",
-            "applications_count": app_count,
-            "jobs_count": job_count,
-            "resumes_stored": resume_count
-        }), 200
-    except ServerSelectionTimeoutError as e:
+        _last_ping.clear()
+        _last_ping.update(result)
+        return dict(result)
+
+def database_error_response(ping):
+    if ping["error_type"] == ServerSelectionTimeoutError.__name__:
         return jsonify({
             "status": "error",
             "message": "Database connection timeout. Check network access/IP whitelist.",
-            "error": str(e)
+            "error": ping["error"]
         }), 503
-    except OperationFailure as e:
+    if ping["error_type"] == OperationFailure.__name__:
         return jsonify({
             "status": "error",
             "message": "Database authentication failed. Check credentials.",
-            "error": str(e)
-        }), 401
+            "error": ping["error"]
+        }), 503
+    return jsonify({
+        "status": "error",
+        "message": "Database unavailable",
+        "error": ping["error"]
+    }), 503
+
+@app.route("/api/health/live", methods=["GET"])
+def health_live():
+    """Liveness: the process is up and serving requests (no DB access)"""
+    return jsonify({"status": "ok"}), 200
+
+@app.route("/api/health", methods=["GET"])
+@app.route("/api/health/ready", methods=["GET"])
+def health():
+    """Readiness: the database answered a ping within the last HEALTH_PING_TTL seconds"""
+    ping = ping_database()
+    if not ping["ok"]:
+        return database_error_response(ping)
+    
+    return jsonify({
+        "status": "ok",
+        "message": "Backend is running",
+        "database": "connected",
+        "storage": "GridFS (MongoDB)"
+    }), 200
+
+@app.route("/api/health/details", methods=["GET"])
+def health_details():
+    """Detailed health: fresh ping latency, approximate counts, pool and cache stats"""
+    try:
+        ping = ping_database(max_age=0)
+        if not ping["ok"]:
+            return database_error_response(ping)
+        
+        db = get_db()
+        return jsonify({
+            "status": "ok",
+            "message": "Backend is running",
+            "database": "connected",
+            "storage": "GridFS (MongoDB)",
+            "ping_ms": ping["latency_ms"],
+            # Counts come from collection metadata, not collection scans
+            "applications_count": db['applications'].estimated_document_count(),
+            "jobs_count": db['jobs'].estimated_document_count(),
+            "resumes_stored": db['fs.files'].estimated_document_count(),
+            "connection_pool": get_db_stats(),
+            "jobs_cache": jobs_cache.stats()
+        }), 200
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -134,9 +426,276 @@ def health():
             "error": str(e)
         }), 500
 
+# Leading bytes of the accepted resume formats
+RESUME_SIGNATURES = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+    (b'PK\x03\x04', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+]
+
+def sniff_resume_type(head):
+    """Content type from the file's magic bytes, or None if it is not a PDF/DOC/DOCX"""
+    for signature, content_type in RESUME_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    # PDF readers accept a header anywhere in the first 1 KB
+    if b'%PDF-' in head[:1024]:
+        return 'application/pdf'
+    return None
+
+# Optional compression at rest: auto (zstd when the zstandard package is
+# installed, else gzip) | zstd | gzip | off. A file is only compressed when
+# a sample of it shrinks by RESUME_COMPRESSION_MIN_SAVING; the codec and
+# the original length are kept in metadata.codec / metadata.raw_length.
+RESUME_COMPRESSION = os.getenv("RESUME_COMPRESSION", "auto").lower()
+RESUME_COMPRESSION_MIN_SAVING = float(os.getenv("RESUME_COMPRESSION_MIN_SAVING", "0.1"))
+RESUME_COMPRESSION_SAMPLE = 256 * 1024
+
+def resume_codec():
+    """Codec configured for new resumes, or None when compression is off"""
+    if RESUME_COMPRESSION == "off":
+        return None
+    if RESUME_COMPRESSION in ("auto", "zstd"):
+        try:
+            import zstandard  # noqa: F401
+            return "zstd"
+        except ImportError:
+            pass
+    return "gzip"
+
+def resume_compressor(codec):
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compressobj()
+    return zlib.compressobj(6, zlib.DEFLATED, 31)  # gzip container
+
+def resume_decompressor(codec):
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(31)
+
+def choose_resume_codec(sample):
+    """The configured codec if it saves enough space on sample, else None"""
+    codec = resume_codec()
+    if codec is None or not sample:
+        return None
+    compressor = resume_compressor(codec)
+    size = len(compressor.compress(sample)) + len(compressor.flush())
+    return codec if size <= len(sample) * (1 - RESUME_COMPRESSION_MIN_SAVING) else None
+
+def stored_codec(grid_file):
+    codec = (grid_file.metadata or {}).get("codec")
+    return codec if codec in ("gzip", "zstd") else None
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Read-only file over a compressed GridFS file that yields the original
+    bytes. Seeking forward decompresses and discards; seeking backward
+    starts over, which is fine for Range requests and one-pass readers.
+    """
+
+    def __init__(self, grid_file, codec):
+        self._grid_file = grid_file
+        self._codec = codec
+        self.length = (grid_file.metadata or {}).get("raw_length")
+        self._restart()
+
+    def _restart(self):
+        self._grid_file.seek(0)
+        self._decompressor = resume_decompressor(self._codec)
+        self._buffer = b""
+        self._position = 0
+
+    def _fill(self, size):
+        while len(self._buffer) < size:
+            data = self._grid_file.read(self._grid_file.chunk_size)
+            if not data:
+                break
+            self._buffer += self._decompressor.decompress(data)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            self._fill(float("inf"))
+            size = len(self._buffer)
+        else:
+            self._fill(size)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self._position += len(data)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.length
+        if offset < self._position:
+            self._restart()
+        while self._position < offset:
+            if not self.read(min(offset - self._position, RESUME_CHUNK_SIZE)):
+                break
+        return self._position
+
+def open_stored_file(grid_file):
+    """File object with the original bytes of a (possibly compressed) GridFS file"""
+    codec = stored_codec(grid_file)
+    return DecompressingReader(grid_file, codec) if codec else grid_file
+
+def write_resume_chunks(grid_in, source, codec):
+    """Copy source into grid_in, compressing with codec when given"""
+    compressor = resume_compressor(codec) if codec else None
+    while True:
+        chunk = source.read(RESUME_CHUNK_SIZE)
+        if not chunk:
+            break
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            grid_in.write(chunk)
+    if compressor:
+        grid_in.write(compressor.flush())
+
+RESUME_STORE_ATTEMPTS = 3
+
+def store_resume_stream(db, fs, stream, first_chunk, metadata, **kwargs):
+    """
+    Store an upload in GridFS, content-addressed by SHA-256.
+    The upload is hashed first; if an identical resume is already stored it
+    gains a reference (metadata.ref_count) instead of being written again.
+    Returns (file_id, size, filename, reused), or None (with nothing left
+    behind) if the upload grows past MAX_RESUME_SIZE.
+    """
+    # Werkzeug spools uploads to a temp file, so the stream can be re-read
+    # after hashing; anything else is copied to our own spool first
+    source = stream if stream.seekable() else tempfile.SpooledTemporaryFile(max_size=MAX_RESUME_SIZE)
+    digest = hashlib.sha256()
+    size = 0
+    chunk = first_chunk
+    try:
+        while chunk:
+            size += len(chunk)
+            if size > MAX_RESUME_SIZE:
+                return None
+            digest.update(chunk)
+            if source is not stream:
+                source.write(chunk)
+            chunk = stream.read(RESUME_CHUNK_SIZE)
+        sha256 = digest.hexdigest()
+
+        def reference_existing():
+            # A file whose count already dropped to 0 is being deleted; never revive it
+            return db['fs.files'].find_one_and_update(
+                {"metadata.sha256": sha256, "metadata.ref_count": {"$gt": 0}},
+                {"$inc": {"metadata.ref_count": 1}},
+                projection={"filename": 1}
+            )
+
+        # Another request may store the same file between our lookup and our
+        # insert (the unique metadata.sha256 index turns that into FileExists),
+        # or the only copy may be mid-delete at ref_count 0; either way look
+        # again and retry
+        for attempt in range(RESUME_STORE_ATTEMPTS):
+            existing = reference_existing()
+            if existing is not None:
+                return existing["_id"], size, existing.get("filename"), True
+
+            # Compress at rest only when a sample shows it is worth it
+            source.seek(0)
+            codec = choose_resume_codec(source.read(RESUME_COMPRESSION_SAMPLE))
+            source.seek(0)
+            grid_in = fs.new_file(chunk_size=RESUME_CHUNK_SIZE, **kwargs)
+            try:
+                write_resume_chunks(grid_in, source, codec)
+                grid_in.metadata = dict(
+                    metadata,
+                    file_size=size,
+                    sha256=sha256,
+                    ref_count=1,
+                    codec=codec or "none",
+                    raw_length=size
+                )
+                grid_in.close()
+            except gridfs.errors.FileExists:
+                # close() already failed on the files document; drop our chunks
+                fs.delete(grid_in._id)
+                if attempt + 1 == RESUME_STORE_ATTEMPTS:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+                continue
+            except Exception:
+                grid_in.abort()
+                raise
+            return grid_in._id, size, kwargs.get("filename"), False
+    finally:
+        if source is not stream:
+            source.close()
+
+# Repeat submissions: a client-supplied Idempotency-Key header replays the
+# original result, and one email may apply once per position (enforced by a
+# unique index on Email Key + Position)
+IDEMPOTENCY_KEY_MAX_LENGTH = 200
+
+def application_email_key(email):
+    """Normalized email used for the one-application-per-position rule"""
+    email = (email or '').strip().lower()
+    return email or None
+
+def find_duplicate_application(db, idempotency_key, email_key, position):
+    """One indexed $or lookup for an earlier submission of the same application"""
+    clauses = []
+    if idempotency_key:
+        clauses.append({"Idempotency Key": idempotency_key})
+    if email_key:
+        clauses.append({"Email Key": email_key, "Position": position})
+    if not clauses:
+        return None
+    return db['applications'].find_one(
+        {"$or": clauses},
+        {"ID": 1, "Position": 1, "Status": 1, "Email Key": 1, "Idempotency Key": 1}
+    )
+
+def duplicate_application_response(existing, idempotency_key, email_key, position):
+    """
+    Replay of the same request (same Idempotency-Key): the original 201 body
+    with 200. The same Idempotency-Key with a different email or position:
+    422. A different submission for the same email and position: 409.
+    """
+    if idempotency_key and existing.get("Idempotency Key") == idempotency_key:
+        if existing.get("Email Key") != email_key or existing.get("Position") != position:
+            return jsonify({"error": "Idempotency-Key was already used for a different application"}), 422
+    body = {
+        "id": str(existing["_id"]),
+        "application_id": existing["ID"],
+        "status": existing.get("Status"),
+        "duplicate": True
+    }
+    if idempotency_key and existing.get("Idempotency Key") == idempotency_key:
+        body["message"] = "Application submitted successfully"
+        return jsonify(body), 200
+    body["error"] = f"You have already applied for {existing.get('Position')}"
+    return jsonify(body), 409
+
 @app.route("/api/apply", methods=["POST"])
 def apply_job():
     try:
+        # Reject oversized uploads before the multipart body is parsed
+        if request.content_length and request.content_length > MAX_RESUME_SIZE + APPLY_FORM_OVERHEAD:
+            return jsonify({"error": f"Resume must be smaller than {MAX_RESUME_SIZE_MB} MB"}), 413
+
         form = request.form
         resume = request.files.get("resume")
         
@@ -149,8 +708,23 @@ def apply_job():
         if file_ext not in allowed_extensions:
             return jsonify({"error": "Only PDF, DOC, and DOCX files are allowed"}), 400
 
-        # Read file content
-        resume_content = resume.read()
+        idempotency_key = (request.headers.get('Idempotency-Key') or '').strip() or None
+        if idempotency_key and len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return jsonify({"error": "Idempotency-Key is too long"}), 400
+        position = form.get("position", "N/A")
+        email_key = application_email_key(form.get("email"))
+
+        # Catch retries and repeat applications before any upload, ID or counter work
+        db = get_db()
+        existing = find_duplicate_application(db, idempotency_key, email_key, position)
+        if existing:
+            return duplicate_application_response(existing, idempotency_key, email_key, position)
+
+        # Check the real file type from its first bytes, not just the extension
+        first_chunk = resume.stream.read(RESUME_CHUNK_SIZE)
+        content_type = sniff_resume_type(first_chunk)
+        if not content_type:
+            return jsonify({"error": "File content is not a valid PDF, DOC or DOCX document"}), 400
         
         # Create filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -158,30 +732,35 @@ def apply_job():
         stored_filename = f"{timestamp}_{original_filename}"
 
         # GridFS for storing resume files
-        db = get_db()
         fs = gridfs.GridFS(db)
 
-        # Store file in GridFS
-        file_id = fs.put(
-            resume_content,
+        # Reserve the application ID before storing anything, so a failed
+        # allocation can never leave an orphaned resume behind
+        next_id = allocate_id(db, "applications")
+
+        # Stream the file into GridFS chunk by chunk (or reference an
+        # identical resume that is already stored)
+        stored = store_resume_stream(
+            db,
+            fs,
+            resume.stream,
+            first_chunk,
             filename=stored_filename,
-            content_type=resume.content_type,
+            content_type=content_type,
             upload_date=datetime.now(),
             metadata={
                 'original_filename': original_filename,
-                'applicant_email': form.get('email'),
-                'file_size': len(resume_content)
+                'applicant_email': form.get('email')
             }
         )
-
-        # Get next ID (sequential)
-        last_app = db['applications'].find_one(sort=[("ID", DESCENDING)])
-        next_id = (last_app['ID'] + 1) if last_app and 'ID' in last_app else 1
+        if stored is None:
+            return jsonify({"error": f"Resume must be smaller than {MAX_RESUME_SIZE_MB} MB"}), 413
+        file_id, resume_size, stored_filename, reused = stored
 
         # Create application document
         application = {
             "ID": next_id,
-            "Position": form.get("position", "N/A"),
+            "Position": position,
             "Name": form.get("name"),
             "Email": form.get("email"),
             "Phone": form.get("phone"),
@@ -192,14 +771,33 @@ def apply_job():
             "Resume File": stored_filename,
             "Resume File ID": str(file_id),  # GridFS file ID
             "Resume Original Name": original_filename,
-            "Resume Size": len(resume_content),
+            "Resume Size": resume_size,
             "Applied Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "Status": "Pending",
+            "Resume Text Status": "pending",
             "Created At": datetime.now()
         }
+        if email_key:
+            application["Email Key"] = email_key
+        if idempotency_key:
+            application["Idempotency Key"] = idempotency_key
 
-        # Insert into MongoDB
-        result = db['applications'].insert_one(application)
+        # Insert into MongoDB (drop the stored resume if the insert fails)
+        try:
+            result = db['applications'].insert_one(application)
+        except DuplicateKeyError:
+            # A concurrent request for the same application won the race
+            delete_resume_files(db, [file_id])
+            existing = find_duplicate_application(db, idempotency_key, email_key, position)
+            if not existing:
+                raise
+            return duplicate_application_response(existing, idempotency_key, email_key, position)
+        except Exception:
+            delete_resume_files(db, [file_id])
+            raise
+        
+        bump_statistics(db, application_stat_delta(application, 1))
+        bump_daily_analytics(db, application["Created At"], application_analytics_delta(application))
         
         # Increment applicant count (Fail-safe: don't block submission if this fails)
         try:
@@ -210,7 +808,10 @@ def apply_job():
         except Exception as e:
             print(f"[WARNING] Failed to update applicant count: {e}")
         
-        print(f"[SUCCESS] Application submitted - ID: {next_id}, Resume stored in GridFS: {file_id}")
+        # Resume text and keywords are extracted in the background
+        queue_resume_extraction()
+        
+        print(f"[SUCCESS] Application submitted - ID: {next_id}, Resume {'shared with an earlier application' if reused else 'stored in GridFS'}: {file_id}")
         
         return jsonify({
             "message": "Application submitted successfully",
@@ -233,9 +834,6 @@ def get_jobs():
         # Optional filters
         job_type = request.args.get('type')
         experience = request.args.get('experience')
-        
-        db = get_db()
-        jobs_collection = db['jobs']
 
         if job_type and job_type != 'all':
             query['type'] = job_type
@@ -243,10 +841,26 @@ def get_jobs():
         if experience and experience != 'all':
             query['experience'] = experience
         
-        jobs = list(jobs_collection.find(query).sort("created_at", DESCENDING))
-        jobs = [serialize_doc(job) for job in jobs]
+        # Ranked full-text search: ?q=...&page=&limit= returns a page envelope
+        search_text = ' '.join((request.args.get('q') or '').lower().split())
+        if search_text:
+            page = max(1, request.args.get('page', 1, type=int))
+            limit = max(1, min(request.args.get('limit', 20, type=int), JOBS_SEARCH_PAGE_MAX))
+            cache_key = ("search", job_type or 'all', experience or 'all', search_text, page, limit)
+            entry = jobs_cache.get_or_load(
+                cache_key,
+                lambda: render_json_entry(search_jobs(get_db(), query, search_text, page, limit))
+            )
+            return conditional_json_response(entry)
         
-        return jsonify(jobs), 200
+        def load_jobs():
+            jobs = get_db()['jobs'].find(query).sort("created_at", DESCENDING)
+            return render_json_entry([serialize_doc(job) for job in jobs])
+        
+        cache_key = ("list", job_type or 'all', experience or 'all')
+        entry = jobs_cache.get_or_load(cache_key, load_jobs)
+        
+        return conditional_json_response(entry)
         
     except Exception as e:
         print(f"Error fetching jobs: {str(e)}")
@@ -255,18 +869,49 @@ def get_jobs():
              return jsonify({"error": "Database Authentication Failed. Check MONGO_PASSWORD."}), 500
         return jsonify({"error": str(e)}), 500
 
+def search_jobs(db, query, search_text, page, limit):
+    """Run a $text search over active jobs, best matches first"""
+    text_query = dict(query)
+    text_query["$text"] = {"$search": search_text}
+    score = {"$meta": "textScore"}
+    
+    def run():
+        cursor = (db['jobs'].find(text_query, {"score": score})
+                  .sort([("score", score), ("created_at", DESCENDING)])
+                  .skip((page - 1) * limit)
+                  .limit(limit))
+        items = [serialize_doc(job) for job in cursor]
+        total = db['jobs'].count_documents(text_query) if page == 1 else None
+        return items, total
+    
+    try:
+        items, total = run()
+    except OperationFailure as e:
+        # IndexNotFound: the deployment never ran create_indexes()
+        if e.code != 27:
+            raise
+        create_jobs_text_index(db)
+        items, total = run()
+    
+    result = {"items": items, "page": page, "limit": limit}
+    if total is not None:
+        result["total"] = total
+    return result
+
 @app.route("/api/jobs/<int:job_id>", methods=["GET"])
 def get_job_by_id(job_id):
     """Public route - Get single job details"""
     try:
-        db = get_db()
-        job = db['jobs'].find_one({"id": job_id, "status": "Active"})
+        entry = jobs_cache.get_or_load(
+            ("job", job_id),
+            lambda: render_json_entry(
+                serialize_doc(get_db()['jobs'].find_one({"id": job_id, "status": "Active"})))
+        )
         
-        if not job:
+        if not entry:
             return jsonify({"error": "Job not found"}), 404
         
-        job = serialize_doc(job)
-        return jsonify(job), 200
+        return conditional_json_response(entry)
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -306,9 +951,24 @@ def admin_login():
 
 # ============ PROTECTED ADMIN ROUTES - APPLICATIONS ============
 
+# Columns an admin may request through ?fields= on the applications list
+APPLICATION_FIELDS = [
+    "ID", "Position", "Name", "Email", "Phone", "College", "Degree",
+    "Passout Year", "Skills", "Resume File", "Resume File ID",
+    "Resume Original Name", "Resume Size", "Applied Date", "Status",
+    "Created At", "Updated At"
+]
+APPLICATIONS_PAGE_MAX = 500
+
 @app.route("/api/admin/applications", methods=["GET"])
 @token_required
 def get_applications():
+    """
+    List applications newest first.
+    Optional keyset pagination: ?limit=N&after=<last ID of previous page>
+    returns {"items", "next_after", "has_more", "total"} instead of a bare list.
+    Optional ?fields=Name,Email,... limits the returned columns.
+    """
     try:
         query = {}
         
@@ -321,13 +981,59 @@ def get_applications():
         if status and status != 'all':
             query['Status'] = status
         
-
+        # Extracted resume text and keywords are large and only used for
+        # search; the duplicate-guard keys and extractor claim are internal
+        projection = {
+            "Resume Text": 0, "Resume Keywords": 0, "Resume Text Claimed At": 0,
+            "Email Key": 0, "Idempotency Key": 0
+        }
+        fields = request.args.get('fields')
+        if fields:
+            requested = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [f for f in requested if f not in APPLICATION_FIELDS]
+            if unknown:
+                return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+            projection = {f: 1 for f in requested}
+            projection["ID"] = 1
+        
+        limit = request.args.get('limit', type=int)
+        after = request.args.get('after', type=int)
         
         db = get_db()
-        applications = list(db['applications'].find(query).sort("ID", DESCENDING))
-        applications = [serialize_doc(app) for app in applications]
         
-        return jsonify(applications), 200
+        if limit is None and after is None:
+            applications = list(db['applications'].find(query, projection).sort("ID", DESCENDING))
+            applications = [serialize_doc(app) for app in applications]
+            return jsonify(applications), 200
+        
+        limit = max(1, min(limit or 50, APPLICATIONS_PAGE_MAX))
+        page_query = dict(query)
+        if after is not None:
+            page_query['ID'] = {"$lt": after}
+        
+        # Fetch one extra row to learn whether another page exists
+        applications = list(db['applications'].find(page_query, projection)
+                            .sort("ID", DESCENDING)
+                            .limit(limit + 1))
+        has_more = len(applications) > limit
+        applications = [serialize_doc(app) for app in applications[:limit]]
+        
+        result = {
+            "items": applications,
+            "has_more": has_more,
+            "next_after": applications[-1]['ID'] if has_more else None
+        }
+        
+        # Count only on the first page (or on request); an unfiltered count
+        # comes from collection metadata instead of scanning the index
+        include_total = request.args.get('include_total')
+        if include_total == '1' or (after is None and include_total != '0'):
+            if query:
+                result["total"] = db['applications'].count_documents(query)
+            else:
+                result["total"] = db['applications'].estimated_document_count()
+        
+        return jsonify(result), 200
     
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -339,20 +1045,15 @@ def get_statistics():
     try:
 
         db = get_db()
-        total = db['applications'].count_documents({})
-        
-        position_pipeline = [
-            {"$group": {"_id": "$Position", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        by_position = {item['_id']: item['count'] 
-                      for item in db['applications'].aggregate(position_pipeline)}
+        rollup = db['statistics'].find_one({"_id": STATS_DOC_ID})
+        if rollup is None or "reconciled_at" not in rollup:
+            # First read (or only partial $inc upserts so far): build it now
+            rollup = reconcile_statistics(db)
+        elif statistics_are_stale(rollup):
+            start_statistics_reconcile()
         
-        status_pipeline = [
-            {"$group": {"_id": "$Status", "count": {"$sum": 1}}}
-        ]
-        by_status_result = {item['_id']: item['count'] 
-                           for item in db['applications'].aggregate(status_pipeline)}
+        by_position = decode_stat_counts(rollup.get("by_position", {}))
+        by_status_result = decode_stat_counts(rollup.get("by_status", {}))
         
         by_status = {
             "Pending": by_status_result.get("Pending", 0),
@@ -362,22 +1063,18 @@ def get_statistics():
             "Rejected": by_status_result.get("Rejected", 0)
         }
         
-        recent = list(db['applications'].find()
+        recent = list(db['applications'].find({}, {field: 1 for field in APPLICATION_FIELDS})
                      .sort("Created At", DESCENDING)
                      .limit(5))
         recent = [serialize_doc(app) for app in recent]
         
-        jobs_count = db['jobs'].count_documents({"status": "Active"})
-        
-        interviews_count = db['interviews'].count_documents({})
-        interviews_scheduled = db['interviews'].count_documents({"status": "Scheduled"})
-        interviews_completed = db['interviews'].count_documents({"status": "Completed"})
+        interviews_by_status = decode_stat_counts(rollup.get("interviews_by_status", {}))
 
         stats = {
-            "total": total,
-            "jobs_active": jobs_count,
-            "interviews_total": interviews_count,
-            "interviews_scheduled": interviews_scheduled,
+            "total": rollup.get("total", 0),
+            "jobs_active": decode_stat_counts(rollup.get("jobs_by_status", {})).get("Active", 0),
+            "interviews_total": rollup.get("interviews_total", 0),
+            "interviews_scheduled": interviews_by_status.get("Scheduled", 0),
             "by_position": by_position,
             "by_status": by_status,
             "recent_applications": recent
@@ -389,6 +1086,99 @@ def get_statistics():
         print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/admin/statistics/reconcile", methods=["POST"])
+@token_required
+def reconcile_statistics_route():
+    """Rebuild the statistics rollup from the collections"""
+    try:
+        rollup = reconcile_statistics(get_db())
+        return jsonify({
+            "message": "Statistics reconciled",
+            "reconciled_at": rollup["reconciled_at"]
+        }), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/analytics", methods=["GET"])
+@token_required
+def get_analytics():
+    """
+    Application volume, funnel and breakdowns over a date range, read from
+    the per-day rollups. ?from=YYYY-MM-DD&to=YYYY-MM-DD (default: last 30
+    days) &granularity=day|week
+    """
+    try:
+        today = datetime.now().date()
+        try:
+            date_to = datetime.strptime(request.args.get('to'), "%Y-%m-%d").date() if request.args.get('to') else today
+            date_from = datetime.strptime(request.args.get('from'), "%Y-%m-%d").date() if request.args.get('from') else date_to - timedelta(days=29)
+        except ValueError:
+            return jsonify({"error": "Dates must use YYYY-MM-DD"}), 400
+        
+        granularity = request.args.get('granularity', 'day')
+        if granularity not in ('day', 'week'):
+            return jsonify({"error": "granularity must be 'day' or 'week'"}), 400
+        if date_from > date_to:
+            return jsonify({"error": "'from' must not be after 'to'"}), 400
+        
+        db = get_db()
+        buckets = db['application_daily'].find(
+            {"_id": {"$gte": date_from.isoformat(), "$lte": date_to.isoformat()}}
+        ).sort("_id", 1)
+        
+        series = OrderedDict()
+        totals = {"applications": 0, "funnel": {}}
+        breakdowns = {dimension: {} for dimension in ANALYTICS_DIMENSIONS.values()}
+        
+        for bucket in buckets:
+            day = datetime.strptime(bucket["_id"], "%Y-%m-%d").date()
+            period = day if granularity == 'day' else day - timedelta(days=day.weekday())
+            point = series.setdefault(period.isoformat(), {"period": period.isoformat(), "applications": 0, "funnel": {}})
+            
+            point["applications"] += bucket.get("applications", 0)
+            totals["applications"] += bucket.get("applications", 0)
+            for status, count in decode_stat_counts(bucket.get("funnel", {})).items():
+                point["funnel"][status] = point["funnel"].get(status, 0) + count
+                totals["funnel"][status] = totals["funnel"].get(status, 0) + count
+            
+            for dimension in breakdowns:
+                for key, count in decode_stat_counts(bucket.get(dimension, {})).items():
+                    breakdowns[dimension][key] = breakdowns[dimension].get(key, 0) + count
+        
+        # Stage-to-stage conversion over the whole range
+        conversion = {}
+        for previous_stage, stage in zip(FUNNEL_STAGES, FUNNEL_STAGES[1:]):
+            entered = totals["funnel"].get(previous_stage, 0)
+            conversion[f"{previous_stage}->{stage}"] = (
+                round(totals["funnel"].get(stage, 0) / entered, 4) if entered else None
+            )
+        
+        return jsonify({
+            "from": date_from.isoformat(),
+            "to": date_to.isoformat(),
+            "granularity": granularity,
+            "series": list(series.values()),
+            "totals": totals,
+            "conversion": conversion,
+            "breakdowns": breakdowns
+        }), 200
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/analytics/backfill", methods=["POST"])
+@token_required
+def backfill_analytics_route():
+    """Rebuild the per-day analytics rollups from existing applications"""
+    try:
+        days = backfill_application_analytics(get_db())
+        return jsonify({"message": "Analytics backfilled", "days": days}), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/api/admin/application/<int:app_id>/status", methods=["PUT"])
 @token_required
 def update_status(app_id):
@@ -402,17 +1192,25 @@ def update_status(app_id):
 
         
         db = get_db()
-        result = db['applications'].update_one(
+        previous = db['applications'].find_one_and_update(
             {"ID": app_id},
             {"$set": {
                 "Status": new_status,
                 "Updated At": datetime.now()
-            }}
+            }},
+            projection={"Status": 1}
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             return jsonify({"error": "Application not found"}), 404
         
+        if previous.get("Status") != new_status:
+            bump_statistics(db, {
+                f"by_status.{stat_key(previous.get('Status'))}": -1,
+                f"by_status.{stat_key(new_status)}": 1
+            })
+            bump_daily_analytics(db, datetime.now(), {f"funnel.{stat_key(new_status)}": 1})
+        
         return jsonify({"message": "Status updated successfully"}), 200
     
     except Exception as e:
@@ -425,23 +1223,26 @@ def delete_application(app_id):
     try:
 
         db = get_db()
-        application = db['applications'].find_one({"ID": app_id})
+        # Delete first: a concurrent delete of the same row then finds
+        # nothing, so the resume and statistics are only released once
+        application = db['applications'].find_one_and_delete(
+            {"ID": app_id},
+            projection={"ID": 1, "Position": 1, "Status": 1, "Resume File ID": 1}
+        )
         
         if not application:
             return jsonify({"error": "Application not found"}), 404
         
         # Delete resume from GridFS
-        fs = gridfs.GridFS(db)
         resume_file_id = application.get('Resume File ID')
         if resume_file_id:
             try:
-                fs.delete(ObjectId(resume_file_id))
+                delete_resume_files(db, [resume_file_id])
                 print(f"[SUCCESS] Deleted resume from GridFS: {resume_file_id}")
             except Exception as e:
                 print(f"[WARNING] Could not delete resume from GridFS: {e}")
         
-        # Delete application document
-        db['applications'].delete_one({"ID": app_id})
+        bump_statistics(db, application_stat_delta(application, -1))
         
         return jsonify({"message": "Application deleted successfully"}), 200
     
@@ -449,75 +1250,281 @@ def delete_application(app_id):
         print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/admin/download-excel", methods=["GET"])
+BULK_MAX_IDS = int(os.getenv("BULK_MAX_IDS", "5000"))
+
+def bulk_selector(data):
+    """
+    Build the application query for a bulk action from {"ids": [...]} or
+    {"filter": {"position": ..., "status": ...}}. Returns (query, ids, error).
+    """
+    ids = data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            return None, None, "ids must be a non-empty list"
+        if len(ids) > BULK_MAX_IDS:
+            return None, None, f"At most {BULK_MAX_IDS} ids per request"
+        try:
+            ids = list(dict.fromkeys(int(app_id) for app_id in ids))
+        except (TypeError, ValueError):
+            return None, None, "ids must be integers"
+        return {"ID": {"$in": ids}}, ids, None
+    
+    filters = data.get('filter') or {}
+    query = {}
+    if filters.get('position') and filters['position'] != 'all':
+        query['Position'] = filters['position']
+    if filters.get('status') and filters['status'] != 'all':
+        query['Status'] = filters['status']
+    if not query:
+        return None, None, "Provide ids or a filter with position and/or status"
+    return query, None, None
+
+def merge_inc(total, delta):
+    for key, value in delta.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+def delete_resume_files(db, file_ids):
+    """
+    Drop one reference per entry in file_ids and delete the GridFS files
+    (and chunks) nobody references any more. Files stored before reference
+    counting count as a single reference. Returns the number of files deleted.
+    """
+    references = {}
+    for file_id in file_ids:
+        try:
+            object_id = ObjectId(file_id)
+        except Exception:
+            print(f"[WARNING] Skipping invalid GridFS file id: {file_id}")
+            continue
+        references[object_id] = references.get(object_id, 0) + 1
+    if not references:
+        return 0
+
+    object_ids = list(references)
+    db['fs.files'].bulk_write([
+        UpdateOne({"_id": object_id, "metadata.ref_count": {"$exists": True}},
+                  {"$inc": {"metadata.ref_count": -count}})
+        for object_id, count in references.items()
+    ], ordered=False)
+    unreferenced = [f["_id"] for f in db['fs.files'].find({
+        "_id": {"$in": object_ids},
+        "$or": [{"metadata.ref_count": {"$lte": 0}}, {"metadata.ref_count": {"$exists": False}}]
+    }, {"_id": 1})]
+    if not unreferenced:
+        return 0
+
+    # Same order as GridFS.delete(): the file disappears before its chunks
+    result = db['fs.files'].delete_many({"_id": {"$in": unreferenced}})
+    db['fs.chunks'].delete_many({"files_id": {"$in": unreferenced}})
+    return result.deleted_count
+
+@app.route("/api/admin/applications/bulk-status", methods=["POST"])
 @token_required
-def admin_download_excel():
+def bulk_update_status():
+    """Set one status on many applications: {"ids": [...] | "filter": {...}, "status": ...}"""
     try:
-        import pandas as pd
-        from openpyxl import load_workbook
-        from openpyxl.styles import Font, PatternFill, Alignment
-
-        query = {}
-        position = request.args.get('position')
+        data = request.json or {}
+        new_status = data.get('status')
         
-        if position and position != 'all':
-            query['Position'] = position
+        if new_status not in ['Pending', 'Reviewed', 'Shortlisted', 'Rejected']:
+            return jsonify({"error": "Invalid status"}), 400
+        
+        query, ids, error = bulk_selector(data)
+        if error:
+            return jsonify({"error": error}), 400
         
         db = get_db()
-        applications = list(db['applications'].find(query).sort("ID", DESCENDING))
+        matched = list(db['applications'].find(query, {"ID": 1, "Status": 1, "_id": 0}))
+        to_update = [app['ID'] for app in matched if app.get('Status') != new_status]
         
-        if not applications:
-            return jsonify({"error": "No data available"}), 404
+        modified = 0
+        if to_update:
+            modified = db['applications'].update_many(
+                {"ID": {"$in": to_update}, "Status": {"$ne": new_status}},
+                {"$set": {"Status": new_status, "Updated At": datetime.now()}}
+            ).modified_count
+            
+            if modified == len(to_update):
+                inc = {f"by_status.{stat_key(new_status)}": modified}
+                for app in matched:
+                    if app.get('Status') != new_status:
+                        merge_inc(inc, {f"by_status.{stat_key(app.get('Status'))}": -1})
+                bump_statistics(db, inc)
+            else:
+                # A concurrent write changed or removed some rows after they
+                # were read, so the old statuses are no longer known
+                start_statistics_reconcile()
+            if modified:
+                bump_daily_analytics(db, datetime.now(), {f"funnel.{stat_key(new_status)}": modified})
         
-        df_data = []
-        for app in applications:
-            df_data.append({
-                "ID": app.get("ID"),
-                "Position": app.get("Position"),
-                "Name": app.get("Name"),
-                "Email": app.get("Email"),
-                "Phone": app.get("Phone"),
-                "College": app.get("College"),
-                "Degree": app.get("Degree"),
-                "Passout Year": app.get("Passout Year"),
-                "Skills": app.get("Skills"),
-                "Resume File": app.get("Resume File"),
-                "Applied Date": app.get("Applied Date"),
-                "Status": app.get("Status")
-            })
+        updated = set(to_update)
+        found = {app['ID'] for app in matched}
+        results = [
+            {"id": app_id, "result": "updated" if app_id in updated else "unchanged"}
+            for app_id in (ids if ids is not None else sorted(found, reverse=True))
+            if app_id in found
+        ]
+        if ids is not None:
+            results += [{"id": app_id, "result": "not_found"} for app_id in ids if app_id not in found]
         
-        df = pd.DataFrame(df_data)
+        return jsonify({
+            "message": f"{modified} application(s) updated",
+            "updated": modified,
+            "results": results
+        }), 200
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/applications/bulk-delete", methods=["POST"])
+@token_required
+def bulk_delete_applications():
+    """Delete many applications and their resumes: {"ids": [...] | "filter": {...}}"""
+    try:
+        data = request.json or {}
+        query, ids, error = bulk_selector(data)
+        if error:
+            return jsonify({"error": error}), 400
         
-        output = BytesIO()
-        df.to_excel(output, index=False, engine='openpyxl')
-        output.seek(0)
+        db = get_db()
+        projection = {"ID": 1, "Position": 1, "Status": 1, "Resume File ID": 1, "_id": 0}
+        candidates = [app['ID'] for app in db['applications'].find(query, {"ID": 1, "_id": 0})]
         
-        wb = load_workbook(output)
-        ws = wb.active
+        # Delete one by one so only rows this request actually removed (not
+        # ones a concurrent delete got first) drive resume and stats cleanup
+        deleted = []
+        for app_id in candidates:
+            app = db['applications'].find_one_and_delete(dict(query, ID=app_id), projection=projection)
+            if app is not None:
+                deleted.append(app)
+        found = [app['ID'] for app in deleted]
         
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
+        if deleted:
+            resume_ids = [app['Resume File ID'] for app in deleted if app.get('Resume File ID')]
+            try:
+                delete_resume_files(db, resume_ids)
+            except Exception as e:
+                print(f"[WARNING] Could not delete resumes from GridFS: {e}")
+            
+            inc = {}
+            for app in deleted:
+                merge_inc(inc, application_stat_delta(app, -1))
+            bump_statistics(db, inc)
         
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        found_set = set(found)
+        results = [{"id": app_id, "result": "deleted"} for app_id in (ids if ids is not None else found) if app_id in found_set]
+        if ids is not None:
+            results += [{"id": app_id, "result": "not_found"} for app_id in ids if app_id not in found_set]
         
-        for column in ws.columns:
-            max_length = 0
-            column = list(column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(cell.value)
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column[0].column_letter].width = adjusted_width
-        
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        return jsonify({
+            "message": f"{len(found)} application(s) deleted",
+            "deleted": len(found),
+            "results": results
+        }), 200
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# Columns exported to Excel, in sheet order
+EXCEL_COLUMNS = [
+    "ID", "Position", "Name", "Email", "Phone", "College", "Degree",
+    "Passout Year", "Skills", "Resume File", "Applied Date", "Status"
+]
+
+def excel_column_widths(db, query):
+    """
+    Longest value per export column, computed server-side in one aggregation.
+    Returns None when nothing matches the query.
+    """
+    group = {"_id": None}
+    for idx, column in enumerate(EXCEL_COLUMNS):
+        group[f"c{idx}"] = {"$max": {"$strLenCP": {"$toString": {"$ifNull": [f"${column}", ""]}}}}
+    
+    result = list(db['applications'].aggregate([{"$match": query}, {"$group": group}]))
+    if not result:
+        return None
+    
+    return {
+        column: min(max(len(column), result[0][f"c{idx}"] or 0) + 2, 50)
+        for idx, column in enumerate(EXCEL_COLUMNS)
+    }
+
+def write_applications_workbook(db, query, output, widths, report=None):
+    """
+    Stream applications from the cursor into a write-only workbook; returns
+    the row count. report(rows) is called every 1000 rows when given.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    
+    # Write-only sheets need their column widths before the first row
+    for idx, column in enumerate(EXCEL_COLUMNS, 1):
+        ws.column_dimensions[get_column_letter(idx)].width = widths[column]
+    
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    header_alignment = Alignment(horizontal='center', vertical='center')
+    
+    header = []
+    for column in EXCEL_COLUMNS:
+        cell = WriteOnlyCell(ws, value=column)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header.append(cell)
+    ws.append(header)
+    
+    rows = 0
+    projection = {column: 1 for column in EXCEL_COLUMNS}
+    cursor = db['applications'].find(query, projection).sort("ID", DESCENDING).batch_size(1000)
+    for app in cursor:
+        ws.append([app.get(column) for column in EXCEL_COLUMNS])
+        rows += 1
+        if report and rows % 1000 == 0:
+            report(rows)
+    
+    wb.save(output)
+    return rows
+
+@app.route("/api/admin/download-excel", methods=["GET"])
+@token_required
+def admin_download_excel():
+    try:
+        query = {}
+        position = request.args.get('position')
+        
+        if position and position != 'all':
+            query['Position'] = position
+        
+        db = get_db()
+        
+        # ?async=1 builds the workbook on the background job pool instead
+        if request.args.get('async') in ('1', 'true'):
+            job, _ = submit_background_job(db, "excel_export", {"position": position or 'all'})
+            return jsonify({"message": "Export queued", "job": serialize_background_job(job)}), 202
+        
+        widths = excel_column_widths(db, query)
+        
+        if widths is None:
+            return jsonify({"error": "No data available"}), 404
+        
+        # Rows go from the cursor to a temp file (the workbook keeps nothing
+        # in memory) and the file is streamed back in blocks
+        output = tempfile.TemporaryFile()
+        try:
+            write_applications_workbook(db, query, output, widths)
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
         
         return send_file(
             output,
@@ -526,12 +1533,51 @@ def admin_download_excel():
             download_name=f"applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         )
     
+    except BackgroundQueueFull as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 # ============ RESUME SERVING ROUTES (GridFS) ============
 
+def gridfs_file_response(grid_file, download_name, as_attachment=False):
+    """
+    Stream a GridFS file chunk by chunk. Supports Range requests (206) for
+    in-browser PDF viewers and conditional requests via ETag/Last-Modified.
+    """
+    # Compressed files are inflated on the fly; clients see the original bytes
+    length = (grid_file.metadata or {}).get("raw_length", grid_file.length)
+    response = Response(
+        FileWrapper(open_stored_file(grid_file), buffer_size=grid_file.chunk_size),
+        mimetype=grid_file.content_type or 'application/pdf',
+        direct_passthrough=True
+    )
+    response.content_length = length
+    
+    # Same Content-Disposition handling as send_file, including non-ASCII names
+    try:
+        download_name.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name).encode("ascii", "ignore").decode("ascii")
+        names = {"filename": simple, "filename*": f"UTF-8''{quote(download_name, safe='!#$&+-.^_`|~')}"}
+    else:
+        names = {"filename": download_name}
+    response.headers.set('Content-Disposition', 'attachment' if as_attachment else 'inline', **names)
+    
+    # GridFS files are immutable, so the file id identifies the content
+    response.set_etag(grid_file.md5 or f"{grid_file._id}-{length}")
+    response.last_modified = grid_file.upload_date
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    
+    try:
+        return response.make_conditional(request, accept_ranges=True, complete_length=length)
+    except HTTPException:
+        # 416 for an unsatisfiable Range; the callers let it through
+        response.close()
+        raise
+
 @app.route('/api/uploads/resumes/<filename>')
 def serve_resume(filename):
     """Serve resume files from GridFS (Protected route)"""
@@ -544,9 +1590,11 @@ def serve_resume(filename):
         
         # Verify the token
         try:
-            jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+            data = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token'}), 401
+        if data.get('scope') == CALENDAR_TOKEN_SCOPE:
+            return jsonify({'error': 'Invalid token'}), 401
         
         # Security check: prevent directory traversal
         if '..' in filename or '/' in filename or '\\' in filename:
@@ -560,18 +1608,10 @@ def serve_resume(filename):
         if not grid_file:
             return jsonify({'error': 'Resume not found'}), 404
         
-        # Read file content
-        file_data = grid_file.read()
-        
-        # Return file with appropriate content type
-        return Response(
-            file_data,
-            mimetype=grid_file.content_type or 'application/pdf',
-            headers={
-                'Content-Disposition': f'inline; filename="{grid_file.filename}"'
-            }
-        )
+        return gridfs_file_response(grid_file, grid_file.filename)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error serving resume: {str(e)}")
         return jsonify({'error': 'Failed to serve resume'}), 500
@@ -593,23 +1633,22 @@ def download_resume(filename):
         if not grid_file:
             return jsonify({'error': 'Resume not found'}), 404
         
-        # Read file content
-        file_data = grid_file.read()
-        
-        # Create BytesIO object
-        file_stream = BytesIO(file_data)
-        
-        # Get original filename from metadata if available
-        original_filename = grid_file.metadata.get('original_filename', filename) if grid_file.metadata else filename
+        # Deduplicated resumes are shared, so the download name comes from the
+        # application (?app_id= picks which one) rather than the file metadata
+        query = {"Resume File": filename}
+        app_id = request.args.get('app_id', type=int)
+        if app_id is not None:
+            query["ID"] = app_id
+        application = db['applications'].find_one(query, {"Resume Original Name": 1}, sort=[("ID", 1)])
+        original_filename = (application or {}).get('Resume Original Name')
+        if not original_filename:
+            original_filename = grid_file.metadata.get('original_filename', filename) if grid_file.metadata else filename
         
         # Return file as attachment
-        return send_file(
-            file_stream,
-            mimetype=grid_file.content_type or 'application/pdf',
-            as_attachment=True,
-            download_name=original_filename
-        )
+        return gridfs_file_response(grid_file, original_filename, as_attachment=True)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error downloading resume: {str(e)}")
         return jsonify({'error': 'Failed to download resume'}), 500
@@ -639,64 +1678,329 @@ def view_resume_by_app_id(app_id):
         except:
             return jsonify({'error': 'Resume file not found in storage'}), 404
         
-        # Read file content
-        file_data = grid_file.read()
-        
-        # Return file
-        return Response(
-            file_data,
-            mimetype=grid_file.content_type or 'application/pdf',
-            headers={
-                'Content-Disposition': f'inline; filename="{grid_file.filename}"'
-            }
-        )
+        return gridfs_file_response(grid_file, application.get('Resume Original Name') or grid_file.filename)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error viewing resume: {str(e)}")
         return jsonify({'error': 'Failed to view resume'}), 500
 
 # ============ PROTECTED ADMIN ROUTES - INTERVIEWS ============
 
+# Interviews carry typed start_at/end_at datetimes next to the original
+# date_time string, always stored as naive UTC. Naive input (e.g. from a
+# datetime-local field) is read as INTERVIEW_TIMEZONE first.
+INTERVIEW_TIMEZONE = os.getenv("INTERVIEW_TIMEZONE", "UTC")
+INTERVIEW_TZ = timezone.utc if INTERVIEW_TIMEZONE.upper() == "UTC" else ZoneInfo(INTERVIEW_TIMEZONE)
+INTERVIEW_STATUSES = ["Scheduled", "Completed", "Cancelled", "No Show"]
+INTERVIEW_DEFAULT_MINUTES = int(os.getenv("INTERVIEW_DEFAULT_MINUTES", "60"))
+# Upper bound on a duration; overlap queries use it to bound their index scan
+INTERVIEW_MAX_MINUTES = 8 * 60
+INTERVIEW_BATCH_MAX = 500
+
+def parse_interview_time(value):
+    """Naive UTC datetime from an ISO 8601 string, or None if it cannot be parsed"""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=INTERVIEW_TZ)
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+def build_interview(data):
+    """Validate a scheduling request; returns (interview without id, error)"""
+    required = ['application_id', 'candidate_email', 'date_time', 'type', 'link']
+    for field in required:
+        if not data.get(field):
+            return None, f"{field} is required"
+
+    start_at = parse_interview_time(data.get("date_time"))
+    if start_at is None:
+        return None, "date_time must be an ISO 8601 date and time"
+    try:
+        duration = int(data.get("duration_minutes") or INTERVIEW_DEFAULT_MINUTES)
+    except (TypeError, ValueError):
+        return None, "duration_minutes must be an integer"
+    if not 1 <= duration <= INTERVIEW_MAX_MINUTES:
+        return None, f"duration_minutes must be between 1 and {INTERVIEW_MAX_MINUTES}"
+
+    now = datetime.now()
+    return {
+        "application_id": data.get("application_id"),
+        "candidate_name": data.get("candidate_name", "Candidate"),
+        "candidate_email": data.get("candidate_email"),
+        "interviewer": data.get("interviewer", "Hiring Manager"),
+        "date_time": data.get("date_time"), # ISO String expected
+        "start_at": start_at,
+        "end_at": start_at + timedelta(minutes=duration),
+        "duration_minutes": duration,
+        "time_zone": INTERVIEW_TIMEZONE,
+        "type": data.get("type"), # Technical, HR, etc.
+        "link": data.get("link"),
+        "status": "Scheduled",
+        "created_at": now,
+        "updated_at": now
+    }, None
+
+def overlap_query(start, end):
+    """
+    Interviews overlapping [start, end). The lower start_at bound (no
+    interview is longer than INTERVIEW_MAX_MINUTES) keeps the scan on the
+    start_at index to the window instead of all earlier history.
+    """
+    return {
+        "start_at": {"$lt": end, "$gt": start - timedelta(minutes=INTERVIEW_MAX_MINUTES)},
+        "end_at": {"$gt": start}
+    }
+
+def find_interview_conflicts(db, interviewer, start, end):
+    query = overlap_query(start, end)
+    query.update({"interviewer": interviewer, "status": "Scheduled"})
+    projection = {"_id": 0, "id": 1, "candidate_name": 1, "start_at": 1, "end_at": 1}
+    return list(db['interviews'].find(query, projection).sort("start_at", 1).limit(10))
+
+# The conflict check and the insert are separate operations, so scheduling
+# holds a short per-interviewer lease in interview_locks around both; it
+# works the same with or without transactions.
+INTERVIEW_LOCK_SECONDS = 15
+INTERVIEW_LOCK_WAIT = 5
+
+class InterviewerBusy(Exception):
+    """Another request is scheduling for the same interviewer"""
+
+@contextmanager
+def interviewer_locks(db, interviewers):
+    """Hold the scheduling lease of every interviewer (sorted, so no deadlock)"""
+    locks = db['interview_locks']
+    owner = ObjectId()
+    held = []
+    try:
+        for name in sorted(set(interviewers)):
+            deadline = time.monotonic() + INTERVIEW_LOCK_WAIT
+            while True:
+                now = datetime.now()
+                try:
+                    # Takes a free or expired lease; a held one makes the upsert collide
+                    locks.update_one(
+                        {"_id": name, "expires_at": {"$lt": now}},
+                        {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=INTERVIEW_LOCK_SECONDS)}},
+                        upsert=True
+                    )
+                    break
+                except DuplicateKeyError:
+                    if time.monotonic() > deadline:
+                        raise InterviewerBusy(f"Another request is scheduling for {name}, try again")
+                    time.sleep(0.05)
+            held.append(name)
+        yield
+    finally:
+        if held:
+            locks.delete_many({"_id": {"$in": held}, "owner": owner})
+
+class IntervalSchedule:
+    """
+    Sorted interval list for one interviewer. Lookups use
+    bisect on start times and only look back INTERVIEW_MAX_MINUTES, so a
+    check costs O(log n + overlaps).
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.intervals = []
+        for interval in sorted(intervals, key=lambda i: i["start_at"]):
+            self.starts.append(interval["start_at"])
+            self.intervals.append(interval)
+
+    def conflicts(self, start, end):
+        from bisect import bisect_left
+        earliest = start - timedelta(minutes=INTERVIEW_MAX_MINUTES)
+        found = []
+        idx = bisect_left(self.starts, end) - 1
+        while idx >= 0 and self.starts[idx] > earliest:
+            if self.intervals[idx]["end_at"] > start:
+                found.append(self.intervals[idx])
+            idx -= 1
+        return found[::-1]
+
+    def add(self, interval):
+        from bisect import bisect_right
+        idx = bisect_right(self.starts, interval["start_at"])
+        self.starts.insert(idx, interval["start_at"])
+        self.intervals.insert(idx, interval)
+
+def serialize_conflicts(conflicts):
+    return [{
+        "id": c.get("id"),
+        "candidate_name": c.get("candidate_name"),
+        "start_at": c["start_at"].isoformat(),
+        "end_at": c["end_at"].isoformat()
+    } for c in conflicts]
+
+def backfill_interview_times(db):
+    """
+    (Re)derive start_at/end_at for interviews stored before times were
+    normalized to UTC, i.e. those without a time_zone
+    """
+    updates = []
+    query = {"time_zone": {"$exists": False}}
+    for interview in db['interviews'].find(query, {"date_time": 1, "duration_minutes": 1}):
+        start_at = parse_interview_time(interview.get("date_time"))
+        if start_at is None:
+            # Mark it so later startups skip it; it never matches a range
+            updates.append(UpdateOne({"_id": interview["_id"]}, {"$set": {
+                "start_at": None,
+                "end_at": None,
+                "time_zone": INTERVIEW_TIMEZONE,
+                "date_time_invalid": True
+            }}))
+            continue
+        duration = interview.get("duration_minutes") or INTERVIEW_DEFAULT_MINUTES
+        updates.append(UpdateOne({"_id": interview["_id"]}, {"$set": {
+            "start_at": start_at,
+            "end_at": start_at + timedelta(minutes=duration),
+            "duration_minutes": duration,
+            "time_zone": INTERVIEW_TIMEZONE
+        }}))
+    if updates:
+        db['interviews'].bulk_write(updates, ordered=False)
+    return len(updates)
+
+def ensure_interview_times(db=None):
+    backfilled = backfill_interview_times(db if db is not None else get_db())
+    if backfilled:
+        print(f"[OK] Normalized start/end times of {backfilled} interview(s) to UTC")
+
 @app.route("/api/admin/interviews", methods=["POST"])
 @token_required
 def schedule_interview():
-    """Schedule a new interview"""
+    """
+    Schedule a new interview. Rejected with 409 if the interviewer already
+    has an overlapping scheduled interview, unless "allow_overlap" is true.
+    """
     try:
-        data = request.json
+        data = request.json or {}
         
         # Validate
-        required = ['application_id', 'candidate_email', 'date_time', 'type', 'link']
-        for field in required:
-            if not data.get(field):
-                return jsonify({"error": f"{field} is required"}), 400
+        interview, error = build_interview(data)
+        if error:
+            return jsonify({"error": error}), 400
         
-        # Get next ID
         db = get_db()
-        last = db['interviews'].find_one(sort=[("id", DESCENDING)])
-        next_id = (last['id'] + 1) if last and 'id' in last else 1
-        
-        interview = {
-            "id": next_id,
-            "application_id": data.get("application_id"),
-            "candidate_name": data.get("candidate_name", "Candidate"),
-            "candidate_email": data.get("candidate_email"),
-            "interviewer": data.get("interviewer", "Hiring Manager"),
-            "date_time": data.get("date_time"), # ISO String expected
-            "type": data.get("type"), # Technical, HR, etc.
-            "link": data.get("link"),
-            "status": "Scheduled",
-            "created_at": datetime.now()
-        }
+        check = not data.get("allow_overlap")
+        with interviewer_locks(db, [interview["interviewer"]] if check else []):
+            if check:
+                conflicts = find_interview_conflicts(db, interview["interviewer"], interview["start_at"], interview["end_at"])
+                if conflicts:
+                    return jsonify({
+                        "error": f"{interview['interviewer']} already has an interview at that time",
+                        "conflicts": serialize_conflicts(conflicts)
+                    }), 409
+            
+            # Get next ID
+            next_id = allocate_id(db, "interviews")
+            interview["id"] = next_id
+            
+            # The invitation is queued with the interview and sent by the
+            # outbox dispatcher, so the request never waits on SMTP
+            write_with_outbox(
+                db,
+                lambda session: db['interviews'].insert_one(interview, session=session),
+                [interview_invitation_message(interview)]
+            )
+        bump_statistics(db, {"interviews_total": 1, "interviews_by_status.Scheduled": 1})
+        
+        return jsonify({"message": "Interview scheduled successfully", "id": next_id}), 201
+        
+    except InterviewerBusy as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/interviews/batch", methods=["POST"])
+@token_required
+def schedule_interviews_batch():
+    """
+    Schedule many interviews at once: {"interviews": [...], "allow_overlap": false}.
+    Overlaps are checked against stored interviews and within the batch
+    using per-interviewer interval lists loaded with one query. Returns a
+    result per entry; conflicting or invalid entries are skipped.
+    """
+    try:
+        data = request.json or {}
+        entries = data.get("interviews")
+        if not isinstance(entries, list) or not entries:
+            return jsonify({"error": "interviews must be a non-empty list"}), 400
+        if len(entries) > INTERVIEW_BATCH_MAX:
+            return jsonify({"error": f"At most {INTERVIEW_BATCH_MAX} interviews per batch"}), 400
         
-        db['interviews'].insert_one(interview)
+        results = [None] * len(entries)
+        candidates = []
+        for idx, entry in enumerate(entries):
+            interview, error = build_interview(entry if isinstance(entry, dict) else {})
+            if error:
+                results[idx] = {"index": idx, "result": "invalid", "error": error}
+            else:
+                candidates.append((idx, interview))
         
-        # Simulate Email Sending
-        print(f"[EMAIL MOCK] To: {data.get('candidate_email')}")
-        print(f"Subject: Interview Invitation - {data.get('type')} Round")
-        print(f"Body: Dear Candidate, your interview is scheduled at {data.get('date_time')}. Link: {data.get('link')}")
+        db = get_db()
+        accepted = []
+        check = not data.get("allow_overlap")
+        with interviewer_locks(db, [i["interviewer"] for _, i in candidates] if check else []):
+            if candidates:
+                schedules = {}
+                if check:
+                    # Every stored interview that could overlap anything in the batch
+                    window_start = min(i["start_at"] for _, i in candidates)
+                    window_end = max(i["end_at"] for _, i in candidates)
+                    query = overlap_query(window_start, window_end)
+                    query.update({
+                        "interviewer": {"$in": list({i["interviewer"] for _, i in candidates})},
+                        "status": "Scheduled"
+                    })
+                    existing = {}
+                    projection = {"_id": 0, "id": 1, "interviewer": 1, "candidate_name": 1, "start_at": 1, "end_at": 1}
+                    for interview in db['interviews'].find(query, projection):
+                        existing.setdefault(interview["interviewer"], []).append(interview)
+                    schedules = {name: IntervalSchedule(items) for name, items in existing.items()}
+            
+                for idx, interview in candidates:
+                    if check:
+                        schedule = schedules.setdefault(interview["interviewer"], IntervalSchedule())
+                        conflicts = schedule.conflicts(interview["start_at"], interview["end_at"])
+                        if conflicts:
+                            results[idx] = {"index": idx, "result": "conflict", "conflicts": serialize_conflicts(conflicts)}
+                            continue
+                        schedule.add(interview)
+                    accepted.append((idx, interview))
         
-        return jsonify({"message": "Interview scheduled successfully", "id": next_id}), 201
+            if accepted:
+                first_id = reserve_ids(db, "interviews", len(accepted))
+                for offset, (idx, interview) in enumerate(accepted):
+                    interview["id"] = first_id + offset
+                    results[idx] = {"index": idx, "result": "scheduled", "id": interview["id"]}
+            
+                interviews = [interview for _, interview in accepted]
+                write_with_outbox(
+                    db,
+                    lambda session: db['interviews'].insert_many(interviews, session=session),
+                    [interview_invitation_message(interview) for interview in interviews]
+                )
+                bump_statistics(db, {"interviews_total": len(interviews), "interviews_by_status.Scheduled": len(interviews)})
         
+        return jsonify({
+            "message": f"{len(accepted)} interview(s) scheduled",
+            "scheduled": len(accepted),
+            "results": results
+        }), 201 if accepted else 409
+        
+    except InterviewerBusy as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -704,33 +2008,256 @@ def schedule_interview():
 @app.route("/api/admin/interviews", methods=["GET"])
 @token_required
 def get_interviews():
-    """Get all interviews"""
+    """
+    Get interviews ordered by start time.
+    Optional ?from=&to= (ISO dates) returns interviews overlapping that
+    range; ?interviewer= and ?status= narrow it further.
+    """
     try:
+        query = {}
+        date_from = request.args.get('from')
+        date_to = request.args.get('to')
+        if date_from or date_to:
+            start = parse_interview_time(date_from) if date_from else None
+            end = parse_interview_time(date_to) if date_to else None
+            if (date_from and start is None) or (date_to and end is None):
+                return jsonify({"error": "from and to must be ISO 8601 dates"}), 400
+            if start and end:
+                if end <= start:
+                    return jsonify({"error": "to must be after from"}), 400
+                query = overlap_query(start, end)
+            elif start:
+                query = {"end_at": {"$gt": start}, "start_at": {"$gt": start - timedelta(minutes=INTERVIEW_MAX_MINUTES)}}
+            else:
+                query = {"start_at": {"$lt": end}}
+        
+        interviewer = request.args.get('interviewer')
+        if interviewer:
+            query["interviewer"] = interviewer
+        status = request.args.get('status')
+        if status and status != 'all':
+            query["status"] = status
 
         db = get_db()
-        interviews = list(db['interviews'].find().sort("date_time", 1))
+        interviews = list(db['interviews'].find(query).sort("start_at", 1))
         interviews = [serialize_doc(i) for i in interviews]
         return jsonify(interviews), 200
     except Exception as e:
+        print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/admin/interviews/<int:interview_id>", methods=["PUT"])
 @token_required
 def update_interview_status(interview_id):
-    """Update interview status (Completed/Cancelled)"""
+    """Update interview status (Completed/Cancelled/No Show)"""
     try:
-        data = request.json
-        status = data.get("status")
-        
+        data = request.json or {}
         status = data.get("status")
+        if status not in INTERVIEW_STATUSES:
+            return jsonify({"error": f"status must be one of: {', '.join(INTERVIEW_STATUSES)}"}), 400
         
         db = get_db()
-        db['interviews'].update_one(
+        previous = db['interviews'].find_one_and_update(
             {"id": interview_id},
-            {"$set": {"status": status}}
+            {"$set": {"status": status, "updated_at": datetime.now()}},
+            projection={"status": 1}
         )
+        if previous is None:
+            return jsonify({"error": "Interview not found"}), 404
+        
+        if previous.get("status") != status:
+            bump_statistics(db, {
+                f"interviews_by_status.{stat_key(previous.get('status'))}": -1,
+                f"interviews_by_status.{stat_key(status)}": 1
+            })
         return jsonify({"message": "Status updated"}), 200
     except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# ============ INTERVIEW CALENDAR FEEDS (iCalendar) ============
+
+# Calendar apps cannot send an Authorization header, so the feeds take
+# ?token= and accept a calendar-scoped token from /calendar-token.
+CALENDAR_TOKEN_DAYS = int(os.getenv("CALENDAR_TOKEN_DAYS", "365"))
+ICS_PAST_DAYS = int(os.getenv("ICS_PAST_DAYS", "30"))
+ICS_FUTURE_DAYS = int(os.getenv("ICS_FUTURE_DAYS", "180"))
+ICS_MAX_DAYS = 400
+ICS_UID_DOMAIN = os.getenv("ICS_UID_DOMAIN", "jobportal")
+ICS_STATUS = {"Scheduled": "CONFIRMED", "Completed": "CONFIRMED", "Cancelled": "CANCELLED", "No Show": "CANCELLED"}
+
+def ics_escape(value):
+    return (str(value or '').replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def ics_line(name, value):
+    """One content line, folded at 75 octets as RFC 5545 requires"""
+    line = f"{name}:{value}".encode("utf-8")
+    parts = []
+    while len(line) > 75:
+        cut = 75 if not parts else 74
+        # Never split a multi-byte UTF-8 character
+        while cut and (line[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(line[:cut])
+        line = line[cut:]
+    parts.append(line)
+    return b"\r\n ".join(parts).decode("utf-8") + "\r\n"
+
+def ics_time(value, local=False):
+    # Interview times are stored as naive UTC; bookkeeping timestamps
+    # (datetime.now(), server local time) are converted to UTC first
+    if local:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+def render_interview_event(interview):
+    changed = interview.get("updated_at") or interview.get("created_at")
+    stamp = ics_time(changed, local=True) if changed else ics_time(interview["start_at"])
+    summary = f"{interview.get('type') or 'Interview'} interview - {interview.get('candidate_name') or 'Candidate'}"
+    description = "\n".join(filter(None, [
+        f"Candidate: {interview.get('candidate_name') or 'Candidate'} <{interview.get('candidate_email')}>",
+        f"Application: {interview.get('application_id')}",
+        f"Interviewer: {interview.get('interviewer')}",
+        f"Status: {interview.get('status')}",
+        f"Link: {interview.get('link')}" if interview.get("link") else None
+    ]))
+    lines = [
+        "BEGIN:VEVENT\r\n",
+        ics_line("UID", f"interview-{interview['id']}@{ICS_UID_DOMAIN}"),
+        ics_line("DTSTAMP", stamp),
+        ics_line("LAST-MODIFIED", stamp),
+        ics_line("DTSTART", ics_time(interview["start_at"])),
+        ics_line("DTEND", ics_time(interview["end_at"])),
+        ics_line("SUMMARY", ics_escape(summary)),
+        ics_line("DESCRIPTION", ics_escape(description)),
+        ics_line("STATUS", ICS_STATUS.get(interview.get("status"), "TENTATIVE"))
+    ]
+    if interview.get("link"):
+        lines.append(ics_line("LOCATION", ics_escape(interview["link"])))
+        lines.append(ics_line("URL", interview["link"]))
+    lines.append("END:VEVENT\r\n")
+    return "".join(lines)
+
+def calendar_feed(interviewer=None):
+    token = request.args.get('token') or request.headers.get('Authorization', '').replace('Bearer ', '')
+    if not token:
+        return jsonify({'error': 'Authentication required'}), 401
+    try:
+        jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        return jsonify({'error': 'Invalid token'}), 401
+
+    # Window anchored on today, so validators stay stable between polls
+    today = parse_interview_time(datetime.combine(datetime.now(INTERVIEW_TZ).date(), datetime.min.time()))
+    start = parse_interview_time(request.args['from']) if request.args.get('from') else today - timedelta(days=ICS_PAST_DAYS)
+    end = parse_interview_time(request.args['to']) if request.args.get('to') else today + timedelta(days=ICS_FUTURE_DAYS)
+    if start is None or end is None or end <= start:
+        return jsonify({"error": "from and to must be ISO 8601 dates with to after from"}), 400
+    if end - start > timedelta(days=ICS_MAX_DAYS):
+        return jsonify({"error": f"The range is limited to {ICS_MAX_DAYS} days"}), 400
+
+    query = overlap_query(start, end)
+    if interviewer:
+        query["interviewer"] = interviewer
+
+    db = get_db()
+    # Validators from one aggregate over the same index range: any insert
+    # or status change moves the count or the latest update time
+    summary = next(db['interviews'].aggregate([
+        {"$match": query},
+        {"$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "last": {"$max": {"$ifNull": ["$updated_at", "$created_at"]}}
+        }}
+    ]), None) or {"count": 0, "last": None}
+    # updated_at/created_at are server local time; HTTP dates are GMT
+    last_modified = summary["last"].replace(microsecond=0).astimezone(timezone.utc) if summary["last"] else None
+    etag = hashlib.sha1(
+        f"{interviewer}|{start}|{end}|{summary['count']}|{summary['last']}".encode()
+    ).hexdigest()
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = bool(
+            last_modified and request.if_modified_since
+            and last_modified <= request.if_modified_since
+        )
+
+    name = f"Interviews - {interviewer}" if interviewer else "Interviews"
+    if not_modified:
+        response = Response(status=304)
+    else:
+        projection = {
+            "_id": 0, "id": 1, "application_id": 1, "candidate_name": 1, "candidate_email": 1,
+            "interviewer": 1, "type": 1, "link": 1, "status": 1, "start_at": 1, "end_at": 1,
+            "created_at": 1, "updated_at": 1
+        }
+        cursor = db['interviews'].find(query, projection).sort("start_at", 1).batch_size(500)
+
+        def generate():
+            yield (
+                "BEGIN:VCALENDAR\r\n"
+                "VERSION:2.0\r\n"
+                "PRODID:-//Job Portal//Interviews//EN\r\n"
+                "CALSCALE:GREGORIAN\r\n"
+                "METHOD:PUBLISH\r\n"
+                + ics_line("X-WR-CALNAME", ics_escape(name))
+                + "REFRESH-INTERVAL;VALUE=DURATION:PT15M\r\n"
+            )
+            try:
+                for interview in cursor:
+                    yield render_interview_event(interview)
+            finally:
+                cursor.close()
+            yield "END:VCALENDAR\r\n"
+
+        response = Response(generate(), mimetype="text/calendar")
+        response.headers.set("Content-Disposition", "inline", filename="interviews.ics")
+
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+@app.route("/api/admin/interviews/calendar-token", methods=["POST"])
+@token_required
+def calendar_token():
+    """Long-lived token that only opens the calendar feeds"""
+    try:
+        token = jwt.encode({
+            'scope': CALENDAR_TOKEN_SCOPE,
+            'exp': datetime.utcnow() + timedelta(days=CALENDAR_TOKEN_DAYS)
+        }, SECRET_KEY, algorithm="HS256")
+        return jsonify({
+            "token": token,
+            "feed": f"/api/admin/interviews/calendar.ics?token={token}",
+            "expires_in_days": CALENDAR_TOKEN_DAYS
+        }), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/interviews/calendar.ics", methods=["GET"])
+def interviews_calendar():
+    """All interviews as an iCalendar feed (?token=, optional ?from=&to=)"""
+    try:
+        return calendar_feed()
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/interviews/calendar/<interviewer>.ics", methods=["GET"])
+def interviewer_calendar(interviewer):
+    """One interviewer's interviews as an iCalendar feed"""
+    try:
+        return calendar_feed(interviewer)
+    except Exception as e:
+        print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 # ============ PROTECTED ADMIN ROUTES - JOBS ============
@@ -749,6 +2276,150 @@ def admin_get_jobs():
         print(f"Error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+JOB_REQUIRED_FIELDS = ['title', 'company', 'location', 'type', 'experience', 'salary', 'description']
+JOB_LIST_FIELDS = ['responsibilities', 'requirements', 'skills', 'benefits']
+JOB_IMPORT_BATCH_SIZE = 500
+
+def validate_job(data):
+    """Return an error message for an invalid job posting, or None"""
+    if not isinstance(data, dict):
+        return "Job must be a JSON object"
+    for field in JOB_REQUIRED_FIELDS:
+        if not data.get(field):
+            return f"{field} is required"
+    for field in JOB_LIST_FIELDS:
+        if field in data and not isinstance(data[field], list):
+            return f"{field} must be a list"
+    return None
+
+def build_job_document(data, job_id):
+    job = {
+        "id": job_id,
+        "title": data.get("title"),
+        "company": data.get("company"),
+        "location": data.get("location"),
+        "type": data.get("type"),
+        "experience": data.get("experience"),
+        "salary": data.get("salary"),
+        "postedDate": "Just now",
+        "applicants": 0,
+        "description": data.get("description"),
+        "responsibilities": data.get("responsibilities", []),
+        "requirements": data.get("requirements", []),
+        "skills": data.get("skills", []),
+        "benefits": data.get("benefits", []),
+        "status": data.get("status", "Active"),
+        "created_at": datetime.now(),
+        "updated_at": datetime.now()
+    }
+    if data.get("experienceLevel"):
+        job["experienceLevel"] = data["experienceLevel"]
+    return job
+
+def import_jobs(db, rows):
+    """
+    Validate and insert many job postings. IDs are reserved in one block and
+    documents are written with unordered insert_many batches.
+    Returns {"inserted", "job_ids", "errors": [{"row", "error"}]} (rows are 1-based).
+    """
+    errors = []
+    valid = []
+    for row_number, data in enumerate(rows, 1):
+        error = data.get("_parse_error") if isinstance(data, dict) else None
+        error = error or validate_job(data)
+        if error:
+            errors.append({"row": row_number, "error": error})
+        else:
+            valid.append((row_number, data))
+    
+    job_ids = []
+    status_inc = {}
+    if valid:
+        first_id = reserve_ids(db, "jobs", len(valid))
+        documents = [(row_number, build_job_document(data, first_id + offset))
+                     for offset, (row_number, data) in enumerate(valid)]
+        
+        for start in range(0, len(documents), JOB_IMPORT_BATCH_SIZE):
+            batch = documents[start:start + JOB_IMPORT_BATCH_SIZE]
+            failed = set()
+            try:
+                db['jobs'].insert_many([doc for _, doc in batch], ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get('writeErrors', []):
+                    failed.add(write_error['index'])
+                    errors.append({"row": batch[write_error['index']][0], "error": write_error.get('errmsg')})
+            for index, (_, doc) in enumerate(batch):
+                if index not in failed:
+                    job_ids.append(doc['id'])
+                    merge_inc(status_inc, {f"jobs_by_status.{stat_key(doc['status'])}": 1})
+        
+        jobs_cache.invalidate()
+        if status_inc:
+            bump_statistics(db, status_inc)
+    
+    errors.sort(key=lambda error: error["row"])
+    return {"inserted": len(job_ids), "job_ids": job_ids, "errors": errors}
+
+def parse_job_import(body, content_type):
+    """Parse a JSON array, NDJSON or CSV (list fields separated by '|') into job dicts"""
+    if 'csv' in content_type:
+        rows = []
+        for record in csv.DictReader(io.StringIO(body)):
+            row = {key.strip(): (value or '').strip() for key, value in record.items() if key}
+            for field in JOB_LIST_FIELDS:
+                if field in row:
+                    row[field] = [item.strip() for item in row[field].split('|') if item.strip()]
+            rows.append({key: value for key, value in row.items() if value != ''})
+        return rows
+    
+    if 'ndjson' in content_type or 'jsonlines' in content_type:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                rows.append({"_parse_error": f"Invalid JSON: {e}"})
+        return rows
+    
+    data = json.loads(body)
+    if isinstance(data, dict):
+        data = data.get('jobs')
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of jobs")
+    return data
+
+@app.route("/api/admin/jobs/import", methods=["POST"])
+@token_required
+def import_jobs_route():
+    """Bulk-create jobs from a JSON array, NDJSON or CSV body (or an uploaded 'file')"""
+    try:
+        upload = request.files.get('file')
+        if upload:
+            body = upload.read().decode('utf-8-sig')
+            name = (upload.filename or '').lower()
+            content_type = 'csv' if name.endswith('.csv') else 'ndjson' if name.endswith(('.ndjson', '.jsonl')) else 'json'
+        else:
+            body = request.get_data(as_text=True)
+            content_type = request.mimetype or 'application/json'
+        
+        try:
+            rows = parse_job_import(body, content_type)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        if not rows:
+            return jsonify({"error": "No jobs to import"}), 400
+        
+        result = import_jobs(get_db(), rows)
+        status_code = 201 if result["inserted"] else 400
+        return jsonify(dict(result, message=f"{result['inserted']} job(s) imported")), status_code
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/api/admin/jobs", methods=["POST"])
 @token_required
 def create_job():
@@ -757,39 +2428,20 @@ def create_job():
         data = request.json
         
         # Validate required fields
-        required_fields = ['title', 'company', 'location', 'type', 'experience', 'salary', 'description']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({"error": f"{field} is required"}), 400
-        
+        error = validate_job(data)
+        if error:
+            return jsonify({"error": error}), 400
         
         # Get next ID
         db = get_db()
-        last_job = db['jobs'].find_one(sort=[("id", DESCENDING)])
-        next_id = (last_job['id'] + 1) if last_job and 'id' in last_job else 1
+        next_id = allocate_id(db, "jobs")
         
         # Create job document
-        job = {
-            "id": next_id,
-            "title": data.get("title"),
-            "company": data.get("company"),
-            "location": data.get("location"),
-            "type": data.get("type"),
-            "experience": data.get("experience"),
-            "salary": data.get("salary"),
-            "postedDate": "Just now",
-            "applicants": 0,
-            "description": data.get("description"),
-            "responsibilities": data.get("responsibilities", []),
-            "requirements": data.get("requirements", []),
-            "skills": data.get("skills", []),
-            "benefits": data.get("benefits", []),
-            "status": data.get("status", "Active"),
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
-        }
+        job = build_job_document(data, next_id)
         
         result = db['jobs'].insert_one(job) # Use db directly
+        jobs_cache.invalidate()
+        bump_statistics(db, {f"jobs_by_status.{stat_key(job['status'])}": 1})
         
         return jsonify({
             "message": "Job created successfully",
@@ -827,14 +2479,22 @@ def update_job(job_id):
 
         
         db = get_db()
-        result = db['jobs'].update_one(
+        previous = db['jobs'].find_one_and_update(
             {"id": job_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"status": 1}
         )
+        jobs_cache.invalidate()
         
-        if result.matched_count == 0:
+        if previous is None:
             return jsonify({"error": "Job not found"}), 404
         
+        if previous.get("status") != update_data["status"]:
+            bump_statistics(db, {
+                f"jobs_by_status.{stat_key(previous.get('status'))}": -1,
+                f"jobs_by_status.{stat_key(update_data['status'])}": 1
+            })
+        
         return jsonify({"message": "Job updated successfully"}), 200
         
     except Exception as e:
@@ -847,11 +2507,14 @@ def delete_job(job_id):
     """Delete a job posting"""
     try:
         db = get_db()
-        result = db['jobs'].delete_one({"id": job_id})
+        deleted = db['jobs'].find_one_and_delete({"id": job_id}, projection={"status": 1})
+        jobs_cache.invalidate()
         
-        if result.deleted_count == 0:
+        if deleted is None:
             return jsonify({"error": "Job not found"}), 404
         
+        bump_statistics(db, {f"jobs_by_status.{stat_key(deleted.get('status'))}": -1})
+        
         return jsonify({"message": "Job deleted successfully"}), 200
         
     except Exception as e:
@@ -875,6 +2538,11 @@ def toggle_job_status(job_id):
             {"id": job_id},
             {"$set": {"status": new_status, "updated_at": datetime.now()}}
         )
+        jobs_cache.invalidate()
+        bump_statistics(db, {
+            f"jobs_by_status.{stat_key(job.get('status'))}": -1,
+            f"jobs_by_status.{stat_key(new_status)}": 1
+        })
         
         return jsonify({"message": "Status updated", "new_status": new_status}), 200
         
@@ -884,101 +2552,1727 @@ def toggle_job_status(job_id):
 
 # ============ HELPER FUNCTIONS ============
 
-def create_indexes():
-    """Create MongoDB indexes for optimized queries"""
-    try:
-        db = get_db()
-        applications_collection = db['applications']
-        jobs_collection = db['jobs']
+# Weighted fields for public job search (title matches rank highest)
+JOBS_TEXT_WEIGHTS = {
+    "title": 10,
+    "skills": 6,
+    "company": 5,
+    "requirements": 3,
+    "description": 1
+}
+JOBS_SEARCH_PAGE_MAX = 100
 
-        # Applications indexes
-        applications_collection.create_index("ID", unique=True)
-        applications_collection.create_index("Email")
-        applications_collection.create_index("Position")
-        applications_collection.create_index("Status")
-        applications_collection.create_index([("Created At", DESCENDING)])
-        
-        # Jobs indexes
-        jobs_collection.create_index("id", unique=True)
-        jobs_collection.create_index("status")
-        jobs_collection.create_index("title")
-        jobs_collection.create_index([("created_at", DESCENDING)])
-        
-        print("[OK] MongoDB indexes created successfully")
+def create_jobs_text_index(db):
+    db['jobs'].create_index(
+        [(field, "text") for field in JOBS_TEXT_WEIGHTS],
+        weights=JOBS_TEXT_WEIGHTS,
+        name="jobs_text_search",
+        default_language="english"
+    )
+
+# Dashboard statistics rollup, kept current with $inc on every write and
+# rebuilt from the collections every STATS_RECONCILE_INTERVAL seconds
+STATS_DOC_ID = "dashboard"
+STATS_RECONCILE_INTERVAL = int(os.getenv("STATS_RECONCILE_INTERVAL", "3600"))
+
+_stats_reconcile_lock = threading.Lock()
+
+def stat_key(value):
+    """Turn a position/status value into a usable MongoDB field name"""
+    return str(value).replace("$", "\uff04").replace(".", "\uff0e")
+
+def decode_stat_counts(counts):
+    """Reverse stat_key() for a rollup sub-document, dropping empty buckets"""
+    return {
+        key.replace("\uff04", "$").replace("\uff0e", "."): count
+        for key, count in counts.items() if count
+    }
+
+def application_stat_delta(application, sign):
+    return {
+        "total": sign,
+        f"by_position.{stat_key(application.get('Position'))}": sign,
+        f"by_status.{stat_key(application.get('Status'))}": sign
+    }
+
+def bump_statistics(db, inc):
+    """Apply $inc deltas to the rollup (Fail-safe: reconciliation repairs missed updates)"""
+    try:
+        db['statistics'].update_one({"_id": STATS_DOC_ID}, {"$inc": inc}, upsert=True)
     except Exception as e:
-        print(f"[WARNING] Could not create indexes: {e}")
+        print(f"[WARNING] Failed to update statistics rollup: {e}")
 
-# ============ MIGRATION HELPER (Optional) ============
+def _count_by(collection, field):
+    pipeline = [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+    return {stat_key(item['_id']): item['count'] for item in collection.aggregate(pipeline)}
 
-@app.route("/admin/migrate-local-to-gridfs", methods=["POST"])
-@token_required
-def migrate_local_to_gridfs():
+def reconcile_statistics(db):
     """
-    One-time migration endpoint to move existing local files to GridFS
-    Call this once after deployment to migrate old resumes
+    Recompute the rollup with full aggregations and replace it.
+    Increments that land while this runs may be lost until the next pass.
     """
+    rollup = {
+        "_id": STATS_DOC_ID,
+        "total": db['applications'].count_documents({}),
+        "by_position": _count_by(db['applications'], "Position"),
+        "by_status": _count_by(db['applications'], "Status"),
+        "jobs_by_status": _count_by(db['jobs'], "status"),
+        "interviews_total": db['interviews'].count_documents({}),
+        "interviews_by_status": _count_by(db['interviews'], "status"),
+        "reconciled_at": datetime.now()
+    }
+    db['statistics'].replace_one({"_id": STATS_DOC_ID}, rollup, upsert=True)
+    return rollup
+
+def statistics_are_stale(rollup):
+    if STATS_RECONCILE_INTERVAL <= 0:
+        return False
+    reconciled_at = rollup.get("reconciled_at")
+    return not reconciled_at or datetime.now() - reconciled_at > timedelta(seconds=STATS_RECONCILE_INTERVAL)
+
+def start_statistics_reconcile():
+    """Reconcile in a background thread unless one is already running"""
+    if not _stats_reconcile_lock.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            reconcile_statistics(get_db())
+            print("[OK] Statistics rollup reconciled")
+        except Exception as e:
+            print(f"[WARNING] Statistics reconciliation failed: {e}")
+        finally:
+            _stats_reconcile_lock.release()
+
+    threading.Thread(target=run, name="stats-reconcile", daemon=True).start()
+
+# Per-day application analytics (application_daily, _id = "YYYY-MM-DD").
+# "funnel" counts applications entering each status on that day.
+FUNNEL_STAGES = ["Pending", "Reviewed", "Shortlisted", "Placed"]
+ANALYTICS_DIMENSIONS = {
+    "Position": "by_position",
+    "College": "by_college",
+    "Degree": "by_degree",
+    "Passout Year": "by_passout_year"
+}
+
+def application_analytics_delta(application):
+    inc = {
+        "applications": 1,
+        f"funnel.{stat_key(application.get('Status'))}": 1
+    }
+    for field, dimension in ANALYTICS_DIMENSIONS.items():
+        inc[f"{dimension}.{stat_key(application.get(field))}"] = 1
+    return inc
+
+def bump_daily_analytics(db, when, inc):
+    """Apply $inc deltas to a day's analytics bucket (Fail-safe: backfill can rebuild it)"""
+    day = when.strftime("%Y-%m-%d")
     try:
-        db = get_db()
-        applications_collection = db['applications']
-        fs = gridfs.GridFS(db)
-        
-        migrated = 0
-        failed = 0
-        
-        # Find all applications with local file paths
-        applications = applications_collection.find({"Resume Path": {"$exists": True}})
-        
-        for app in applications:
-            try:
-                resume_path = app.get('Resume Path')
-                
-                # Check if file exists locally
-                if resume_path and os.path.exists(resume_path):
-                    # Read file
-                    with open(resume_path, 'rb') as f:
-                        file_content = f.read()
-                    
-                    # Store in GridFS
-                    file_id = fs.put(
-                        file_content,
-                        filename=app.get('Resume File'),
-                        content_type='application/pdf',
-                        upload_date=app.get('Created At', datetime.now()),
-                        metadata={
-                            'original_filename': app.get('Resume File'),
-                            'applicant_email': app.get('Email'),
-                            'migrated': True
-                        }
-                    )
-                    
-                    # Update application document
-                    applications_collection.update_one(
-                        {"_id": app['_id']},
-                        {
-                            "$set": {
-                                "Resume File ID": str(file_id),
-                                "Migrated to GridFS": True
-                            },
-                            "$unset": {"Resume Path": ""}
-                        }
-                    )
-                    
-                    migrated += 1
-                    print(f"[MIGRATED] {app.get('Resume File')} -> GridFS")
-                
-            except Exception as e:
-                failed += 1
-                print(f"[FAILED] Migration error for app {app.get('ID')}: {e}")
-        
-        return jsonify({
-            "message": "Migration completed",
-            "migrated": migrated,
-            "failed": failed
-        }), 200
-        
+        db['application_daily'].update_one(
+            {"_id": day},
+            {"$inc": inc, "$setOnInsert": {"date": datetime.strptime(day, "%Y-%m-%d")}},
+            upsert=True
+        )
     except Exception as e:
-        print(f"Error during migration: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        print(f"[WARNING] Failed to update analytics bucket {day}: {e}")
+
+def backfill_application_analytics(db):
+    """
+    Rebuild the volume and breakdown counts of every day bucket from
+    "Created At". Historical status changes are not recorded, so funnel
+    counts (each application's current status on the day it was last
+    updated, or created) only fill days that have no bucket yet; live-tracked
+    transition counts are left alone. Returns the number of days written.
+    """
+    def day_of(field):
+        return {"$dateToString": {"format": "%Y-%m-%d", "date": field}}
+    
+    has_date = {"$match": {"Created At": {"$type": "date"}}}
+    days = {}
+    
+    def bucket(day):
+        return days.setdefault(day, {
+            "_id": day,
+            "date": datetime.strptime(day, "%Y-%m-%d"),
+            "applications": 0,
+            "funnel": {},
+            **{dimension: {} for dimension in ANALYTICS_DIMENSIONS.values()}
+        })
+    
+    for item in db['applications'].aggregate([
+        has_date,
+        {"$group": {"_id": day_of("$Created At"), "count": {"$sum": 1}}}
+    ]):
+        bucket(item['_id'])["applications"] = item['count']
+        bucket(item['_id'])["funnel"]["Pending"] = item['count']
+    
+    for field, dimension in ANALYTICS_DIMENSIONS.items():
+        for item in db['applications'].aggregate([
+            has_date,
+            {"$group": {"_id": {"day": day_of("$Created At"), "value": f"${field}"}, "count": {"$sum": 1}}}
+        ]):
+            bucket(item['_id']['day'])[dimension][stat_key(item['_id'].get('value'))] = item['count']
+    
+    for item in db['applications'].aggregate([
+        has_date,
+        {"$match": {"Status": {"$ne": "Pending"}}},
+        {"$group": {
+            "_id": {"day": day_of({"$ifNull": ["$Updated At", "$Created At"]}), "status": "$Status"},
+            "count": {"$sum": 1}
+        }}
+    ]):
+        funnel = bucket(item['_id']['day'])["funnel"]
+        key = stat_key(item['_id'].get('status'))
+        funnel[key] = funnel.get(key, 0) + item['count']
+    
+    requests = [
+        UpdateOne(
+            {"_id": day},
+            {
+                "$set": {field: doc[field] for field in ["applications", *ANALYTICS_DIMENSIONS.values()]},
+                "$setOnInsert": {"date": doc["date"], "funnel": doc["funnel"]}
+            },
+            upsert=True
+        )
+        for day, doc in days.items()
+    ]
+    for start in range(0, len(requests), 500):
+        db['application_daily'].bulk_write(requests[start:start + 500], ordered=False)
+    return len(requests)
+
+# Sequential ID counters: counter name -> (collection, ID field)
+ID_COUNTERS = {
+    "applications": ("applications", "ID"),
+    "jobs": ("jobs", "id"),
+    "interviews": ("interviews", "id")
+}
+# IDs reserved per counter round trip; values > 1 let each worker hand out
+# IDs from a local block (IDs stay unique but may interleave across workers)
+ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", "1"))
+
+_id_lock = threading.Lock()
+_id_blocks = {}  # counter name -> [next_id, last_id] reserved by this process
+_seeded_counters = set()
+
+def sync_id_counter(db, name, floor=0):
+    """Raise the counter (never lower it) above every stored ID and `floor`"""
+    collection, field = ID_COUNTERS[name]
+    last = db[collection].find_one(
+        {field: {"$type": "number"}},
+        sort=[(field, DESCENDING)],
+        projection={field: 1}
+    )
+    current_max = max(int(last[field]) if last else 0, floor)
+    # $max keeps this idempotent when several workers seed concurrently
+    db['counters'].update_one({"_id": name}, {"$max": {"seq": current_max}}, upsert=True)
+
+def _seed_counter(db, name):
+    """Start the counter above any ID already stored (once per process)"""
+    if name in _seeded_counters:
+        return
+    sync_id_counter(db, name)
+    _seeded_counters.add(name)
+
+def reserve_ids(db, name, count=1):
+    """Atomically reserve `count` consecutive IDs and return the first one"""
+    _seed_counter(db, name)
+    counter = db['counters'].find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return int(counter['seq']) - count + 1
+
+def allocate_id(db, name):
+    """Next sequential ID for a collection, served from the local block if one is reserved"""
+    if ID_BLOCK_SIZE <= 1:
+        return reserve_ids(db, name)
+
+    with _id_lock:
+        block = _id_blocks.get(name)
+        if not block or block[0] > block[1]:
+            first = reserve_ids(db, name, ID_BLOCK_SIZE)
+            block = _id_blocks[name] = [first, first + ID_BLOCK_SIZE - 1]
+        allocated = block[0]
+        block[0] += 1
+        return allocated
+
+def _reset_id_blocks_after_fork():
+    # A forked child must not hand out IDs from its parent's reserved block
+    global _id_lock
+    _id_lock = threading.Lock()
+    _id_blocks.clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_blocks_after_fork)
+
+def create_indexes():
+    """
+    Create MongoDB indexes for optimized queries. Runs as a startup step on
+    every server (see start_background_workers): several write paths rely on
+    the unique ones, so failures raise and the step is retried.
+    """
+    db = get_db()
+    applications_collection = db['applications']
+    jobs_collection = db['jobs']
+    interviews_collection = db['interviews']
+
+    # Applications indexes
+    applications_collection.create_index("ID", unique=True)
+    applications_collection.create_index("Email")
+    # One application per email and position; Idempotency-Key replays
+    applications_collection.create_index(
+        [("Email Key", 1), ("Position", 1)],
+        unique=True,
+        partialFilterExpression={"Email Key": {"$type": "string"}}
+    )
+    applications_collection.create_index(
+        "Idempotency Key",
+        unique=True,
+        partialFilterExpression={"Idempotency Key": {"$type": "string"}}
+    )
+    # Filtered, ID-ordered pages (also serve Position/Status-only lookups)
+    applications_collection.create_index([("Position", 1), ("ID", DESCENDING)])
+    applications_collection.create_index([("Status", 1), ("ID", DESCENDING)])
+    applications_collection.create_index([("Position", 1), ("Status", 1), ("ID", DESCENDING)])
+    applications_collection.create_index([("Created At", DESCENDING)])
+    applications_collection.create_index("Resume Keywords")
+    applications_collection.create_index("Resume Text Status", sparse=True)
+    create_applications_text_index(db)
+    
+    # Jobs indexes
+    jobs_collection.create_index("id", unique=True)
+    jobs_collection.create_index("status")
+    jobs_collection.create_index("title")
+    jobs_collection.create_index([("created_at", DESCENDING)])
+    create_jobs_text_index(db)
+
+    # Content-addressed resumes: one GridFS file per distinct SHA-256
+    db['fs.files'].create_index(
+        "metadata.sha256",
+        unique=True,
+        partialFilterExpression={"metadata.sha256": {"$exists": True}}
+    )
+    
+    # Interviews indexes
+    interviews_collection.create_index("id", unique=True)
+    # Calendar ranges, per interviewer and overall
+    interviews_collection.create_index([("interviewer", 1), ("start_at", 1)])
+    interviews_collection.create_index([("start_at", 1)])
+
+    # Outbox: due messages in send order
+    db['outbox'].create_index([("status", 1), ("next_attempt_at", 1)])
+    
+    print("[OK] MongoDB indexes created successfully")
+
+# ============ BACKGROUND JOBS ============
+
+# Heavy admin operations run on a small in-process worker pool instead of a
+# request thread. Job state lives in background_jobs so any instance can
+# report on it and a restart can pick up work that was cut off; file results
+# are stored in GridFS for download.
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "2"))
+BACKGROUND_QUEUE_MAX = int(os.getenv("BACKGROUND_QUEUE_MAX", "20"))
+BACKGROUND_JOB_STALE_SECONDS = int(os.getenv("BACKGROUND_JOB_STALE_SECONDS", "300"))
+BACKGROUND_JOB_MAX_ATTEMPTS = 3
+BACKGROUND_HEARTBEAT_INTERVAL = 5  # seconds between progress writes
+
+class BackgroundQueueFull(Exception):
+    """BACKGROUND_QUEUE_MAX jobs are already queued or running"""
+
+JOB_HANDLERS = {}
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+def background_job(job_type, unique=False):
+    """
+    Register handler(db, params, report) for a job type. report(done, total=None,
+    message=None) records progress. A handler may return a dict with "file"
+    (a readable binary file), "filename" and "content_type" to store a
+    downloadable result; any other keys are saved as the job's result.
+    unique job types run at most once at a time.
+    """
+    def register(handler):
+        JOB_HANDLERS[job_type] = {"handler": handler, "unique": unique}
+        return handler
+    return register
+
+def get_job_executor():
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _job_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="background-job")
+        return _job_executor
+
+def _reset_job_executor_after_fork():
+    # Worker threads do not survive a fork
+    global _job_executor, _job_executor_lock
+    _job_executor = None
+    _job_executor_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_job_executor_after_fork)
+
+def submit_background_job(db, job_type, params=None):
+    """
+    Queue a job and return (job, created). For unique job types an active
+    job of the same type is returned instead of queueing another.
+    Raises ValueError for unknown types and BackgroundQueueFull when the queue is full.
+    """
+    spec = JOB_HANDLERS.get(job_type)
+    if spec is None:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    jobs_collection = db['background_jobs']
+    active = {"status": {"$in": ["queued", "running"]}}
+    if spec["unique"]:
+        existing = jobs_collection.find_one(dict(active, type=job_type))
+        if existing is not None:
+            return existing, False
+    if jobs_collection.count_documents(active) >= BACKGROUND_QUEUE_MAX:
+        raise BackgroundQueueFull("Too many background jobs queued, try again later")
+
+    now = datetime.now()
+    job = {
+        "type": job_type,
+        "params": params or {},
+        "status": "queued",
+        "attempts": 0,
+        "progress": {"done": 0, "total": None, "message": None},
+        "created_at": now,
+        "updated_at": now
+    }
+    job["_id"] = jobs_collection.insert_one(job).inserted_id
+    get_job_executor().submit(run_background_job, job["_id"])
+    return job, True
+
+def run_background_job(job_id):
+    db = get_db()
+    jobs_collection = db['background_jobs']
+
+    # Claim atomically so two instances never run the same job
+    now = datetime.now()
+    job = jobs_collection.find_one_and_update(
+        {"_id": job_id, "status": "queued"},
+        {"$set": {"status": "running", "started_at": now, "updated_at": now, "heartbeat_at": now},
+         "$inc": {"attempts": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if job is None:
+        return
+
+    last_write = [0.0]
+
+    def report(done, total=None, message=None):
+        # Progress doubles as the heartbeat; throttle the writes
+        if time.monotonic() - last_write[0] < BACKGROUND_HEARTBEAT_INTERVAL and (total is None or done < total):
+            return
+        last_write[0] = time.monotonic()
+        update = {"progress.done": done, "heartbeat_at": datetime.now(), "updated_at": datetime.now()}
+        if total is not None:
+            update["progress.total"] = total
+        if message is not None:
+            update["progress.message"] = message
+        jobs_collection.update_one({"_id": job_id}, {"$set": update})
+
+    try:
+        result = JOB_HANDLERS[job["type"]]["handler"](db, job["params"], report) or {}
+        update = {"status": "completed", "finished_at": datetime.now(), "updated_at": datetime.now()}
+
+        result_file = result.pop("file", None)
+        if result_file is not None:
+            filename = result.pop("filename", f"{job['type']}_{job_id}")
+            content_type = result.pop("content_type", "application/octet-stream")
+            try:
+                file_id = gridfs.GridFS(db).put(
+                    result_file,
+                    filename=filename,
+                    content_type=content_type,
+                    metadata={"background_job": job_id}
+                )
+            finally:
+                result_file.close()
+            update.update({"result_file_id": file_id, "result_filename": filename})
+        update["result"] = result
+
+        jobs_collection.update_one({"_id": job_id}, {"$set": update})
+        print(f"[SUCCESS] Background job {job_id} ({job['type']}) completed")
+    except Exception as e:
+        print(f"[WARNING] Background job {job_id} ({job['type']}) failed: {e}")
+        jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "error": str(e), "finished_at": datetime.now(), "updated_at": datetime.now()}}
+        )
+
+def recover_background_jobs():
+    """
+    Requeue jobs cut off by a restart (running with a stale heartbeat) and
+    queued jobs that no worker picked up; give up after
+    BACKGROUND_JOB_MAX_ATTEMPTS.
+    """
+    try:
+        db = get_db()
+        jobs_collection = db['background_jobs']
+        stale = datetime.now() - timedelta(seconds=BACKGROUND_JOB_STALE_SECONDS)
+        interrupted = {"status": "running", "heartbeat_at": {"$lt": stale}}
+
+        jobs_collection.update_many(
+            dict(interrupted, attempts={"$gte": BACKGROUND_JOB_MAX_ATTEMPTS}),
+            {"$set": {"status": "failed", "error": "Interrupted too many times", "finished_at": datetime.now()}}
+        )
+        jobs_collection.update_many(interrupted, {"$set": {"status": "queued", "updated_at": datetime.now()}})
+
+        requeued = 0
+        for job in jobs_collection.find({"status": "queued"}, {"_id": 1}).sort("created_at", 1):
+            get_job_executor().submit(run_background_job, job["_id"])
+            requeued += 1
+        if requeued:
+            print(f"[OK] Resumed {requeued} background job(s)")
+        return True
+    except Exception as e:
+        print(f"[WARNING] Could not recover background jobs: {e}")
+        return False
+
+_jobs_recovered = False
+
+def ensure_background_jobs_recovered():
+    """Run recover_background_jobs once per process (again until it succeeds)"""
+    global _jobs_recovered
+    if not _jobs_recovered:
+        # Claims are atomic, so a job requeued twice still runs once
+        _jobs_recovered = recover_background_jobs()
+    return _jobs_recovered
+
+def serialize_background_job(job):
+    job = serialize_doc(dict(job))
+    if job.get("result_file_id"):
+        job["result_file_id"] = str(job["result_file_id"])
+        job["result_url"] = f"/api/admin/jobs-queue/{job['_id']}/result"
+    return job
+
+@background_job("excel_export")
+def excel_export_job(db, params, report):
+    query = {}
+    if params.get("position") and params["position"] != "all":
+        query["Position"] = params["position"]
+
+    widths = excel_column_widths(db, query)
+    if widths is None:
+        raise ValueError("No data available")
+
+    output = tempfile.TemporaryFile()
+    try:
+        rows = write_applications_workbook(db, query, output, widths, report)
+        report(rows, rows)
+        output.seek(0)
+    except Exception:
+        output.close()
+        raise
+    return {
+        "file": output,
+        "filename": f"applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "rows": rows
+    }
+
+@app.route("/api/admin/jobs-queue", methods=["POST"])
+@token_required
+def submit_background_job_route():
+    """Queue a background job: {"type": "excel_export", "params": {...}}"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job_type = data.get("type")
+        ensure_background_jobs_recovered()
+        if job_type not in JOB_HANDLERS:
+            return jsonify({"error": f"type must be one of: {', '.join(sorted(JOB_HANDLERS))}"}), 400
+
+        job, created = submit_background_job(get_db(), job_type, data.get("params") or {})
+        return jsonify({
+            "message": "Job queued" if created else "Job already running",
+            "job": serialize_background_job(job)
+        }), 202 if created else 409
+    except BackgroundQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/jobs-queue", methods=["GET"])
+@token_required
+def list_background_jobs():
+    try:
+        ensure_background_jobs_recovered()
+        query = {}
+        if request.args.get("status"):
+            query["status"] = request.args["status"]
+        if request.args.get("type"):
+            query["type"] = request.args["type"]
+        jobs = get_db()['background_jobs'].find(query).sort("created_at", DESCENDING).limit(50)
+        return jsonify([serialize_background_job(job) for job in jobs]), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/jobs-queue/<job_id>", methods=["GET"])
+@token_required
+def get_background_job(job_id):
+    try:
+        if not ObjectId.is_valid(job_id):
+            return jsonify({"error": "Job not found"}), 404
+        ensure_background_jobs_recovered()
+        job = get_db()['background_jobs'].find_one({"_id": ObjectId(job_id)})
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(serialize_background_job(job)), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/jobs-queue/<job_id>/result", methods=["GET"])
+@token_required
+def download_background_job_result(job_id):
+    try:
+        if not ObjectId.is_valid(job_id):
+            return jsonify({"error": "Job not found"}), 404
+        db = get_db()
+        job = db['background_jobs'].find_one({"_id": ObjectId(job_id)})
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        if not job.get("result_file_id"):
+            return jsonify({"error": "Job has no downloadable result", "status": job["status"]}), 404
+
+        grid_file = gridfs.GridFS(db).find_one({"_id": job["result_file_id"]})
+        if not grid_file:
+            return jsonify({"error": "Result file not found"}), 404
+        return gridfs_file_response(grid_file, job.get("result_filename") or grid_file.filename, as_attachment=True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# ============ NOTIFICATION OUTBOX ============
+
+# Outgoing email is written to the outbox collection in the same transaction
+# as the record it belongs to; a dispatcher thread drains it in batches over
+# one SMTP connection, retrying failures with exponential backoff.
+# Without SMTP_HOST messages are only printed. For local testing point
+# SMTP_HOST/SMTP_PORT at a debugging server, e.g.
+#   python -m aiosmtpd -n -l localhost:8025
+SMTP_HOST = os.getenv("SMTP_HOST", "")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USER = os.getenv("SMTP_USER", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+MAIL_FROM = os.getenv("MAIL_FROM", "no-reply@jobportal.local")
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_RETRY_BASE = 30  # seconds; doubles per failed attempt
+OUTBOX_RETRY_MAX = 3600
+OUTBOX_CLAIM_TIMEOUT = 600  # a "sending" message older than this is retried
+
+_outbox_wakeup = threading.Event()
+_outbox_thread = None
+_outbox_thread_lock = threading.Lock()
+
+def transactions_supported(client):
+    """Multi-document transactions need a replica set or sharded cluster"""
+    description = getattr(client, "topology_description", None)
+    return description is not None and description.topology_type_name in (
+        "ReplicaSetWithPrimary", "Sharded", "LoadBalanced"
+    )
+
+def run_in_transaction(db, write):
+    """
+    Run write(session) in a transaction where the deployment supports one;
+    on a standalone server it runs with session=None, so write() should
+    issue its most important write last.
+    """
+    client = db.client
+    if transactions_supported(client):
+        with client.start_session() as session:
+            session.with_transaction(write)
+    else:
+        write(None)
+
+def write_with_outbox(db, write, messages):
+    """
+    Run write(session) and queue the outbox messages atomically. Falls back
+    to two plain writes (record first) on a standalone server.
+    """
+    now = datetime.now()
+    documents = [dict(
+        message,
+        status="pending",
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now
+    ) for message in messages]
+
+    def run(session):
+        write(session)
+        if documents:
+            db['outbox'].insert_many(documents, session=session)
+    run_in_transaction(db, run)
+
+    if documents:
+        start_outbox_dispatcher()
+        _outbox_wakeup.set()
+
+def interview_invitation_message(interview):
+    return {
+        "kind": "interview_invitation",
+        "ref": {"interview_id": interview["id"]},
+        "to": interview["candidate_email"],
+        "subject": f"Interview Invitation - {interview['type']} Round",
+        "body": (
+            f"Dear {interview.get('candidate_name') or 'Candidate'}, your interview is scheduled at "
+            f"{interview['date_time']}. Link: {interview['link']}"
+        )
+    }
+
+def claim_outbox_batch(db, limit=OUTBOX_BATCH_SIZE):
+    """Mark up to limit due messages as "sending" and return them"""
+    now = datetime.now()
+    due = {"$or": [
+        {"status": "pending", "next_attempt_at": {"$lte": now}},
+        {"status": "sending", "claimed_at": {"$lt": now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT)}}
+    ]}
+    batch = []
+    while len(batch) < limit:
+        message = db['outbox'].find_one_and_update(
+            due,
+            {"$set": {"status": "sending", "claimed_at": now}, "$inc": {"attempts": 1}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if message is None:
+            break
+        batch.append(message)
+    return batch
+
+def send_outbox_batch(messages):
+    """Send over one SMTP connection; returns {message _id: error or None}"""
+    if not SMTP_HOST:
+        for message in messages:
+            print(f"[EMAIL MOCK] To: {message['to']}")
+            print(f"Subject: {message['subject']}")
+            print(f"Body: {message['body']}")
+        return {message["_id"]: None for message in messages}
+
+    import smtplib
+    from email.message import EmailMessage
+
+    results = {}
+    try:
+        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT) as smtp:
+            if SMTP_STARTTLS:
+                smtp.starttls()
+            if SMTP_USER:
+                smtp.login(SMTP_USER, SMTP_PASSWORD)
+            for message in messages:
+                email = EmailMessage()
+                email["From"] = MAIL_FROM
+                email["To"] = message["to"]
+                email["Subject"] = message["subject"]
+                email.set_content(message["body"])
+                try:
+                    smtp.send_message(email)
+                    results[message["_id"]] = None
+                except smtplib.SMTPException as e:
+                    results[message["_id"]] = str(e)
+    except (OSError, smtplib.SMTPException) as e:
+        # Connection-level failure: everything not yet sent is retried
+        for message in messages:
+            results.setdefault(message["_id"], str(e))
+    return results
+
+def dispatch_outbox(db):
+    """Send one batch of due messages; returns the number claimed"""
+    messages = claim_outbox_batch(db)
+    if not messages:
+        return 0
+
+    results = send_outbox_batch(messages)
+    now = datetime.now()
+    updates = []
+    for message in messages:
+        error = results.get(message["_id"])
+        if error is None:
+            update = {"$set": {"status": "sent", "sent_at": now}, "$unset": {"claimed_at": "", "last_error": ""}}
+        elif message["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+            update = {"$set": {"status": "failed", "last_error": error}, "$unset": {"claimed_at": ""}}
+            print(f"[WARNING] Giving up on email to {message['to']}: {error}")
+        else:
+            delay = min(OUTBOX_RETRY_BASE * 2 ** (message["attempts"] - 1), OUTBOX_RETRY_MAX)
+            update = {
+                "$set": {"status": "pending", "last_error": error, "next_attempt_at": now + timedelta(seconds=delay)},
+                "$unset": {"claimed_at": ""}
+            }
+        updates.append(UpdateOne({"_id": message["_id"]}, update))
+    db['outbox'].bulk_write(updates, ordered=False)
+    return len(messages)
+
+def _outbox_loop():
+    while True:
+        _outbox_wakeup.wait(OUTBOX_POLL_INTERVAL)
+        _outbox_wakeup.clear()
+        try:
+            db = get_db()
+            # Keep going while full batches come back
+            while dispatch_outbox(db) >= OUTBOX_BATCH_SIZE:
+                pass
+        except Exception as e:
+            print(f"[WARNING] Outbox dispatch failed: {e}")
+
+def start_outbox_dispatcher():
+    """Start the dispatcher thread once per process"""
+    global _outbox_thread
+    with _outbox_thread_lock:
+        if _outbox_thread is None or not _outbox_thread.is_alive():
+            _outbox_thread = threading.Thread(target=_outbox_loop, name="outbox-dispatcher", daemon=True)
+            _outbox_thread.start()
+            _outbox_wakeup.set()
+
+def _reset_outbox_after_fork():
+    global _outbox_thread, _outbox_thread_lock
+    _outbox_thread = None
+    _outbox_thread_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_outbox_after_fork)
+
+@app.route("/api/admin/outbox", methods=["GET"])
+@token_required
+def outbox_status():
+    """Outbox counts by status plus the most recent failures"""
+    try:
+        db = get_db()
+        start_outbox_dispatcher()
+        counts = {row["_id"]: row["count"] for row in db['outbox'].aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ])}
+        failed = db['outbox'].find(
+            {"status": "failed"},
+            {"to": 1, "subject": 1, "attempts": 1, "last_error": 1, "created_at": 1}
+        ).sort("created_at", DESCENDING).limit(20)
+        return jsonify({
+            "counts": counts,
+            "smtp": SMTP_HOST or "mock",
+            "failed": [serialize_doc(message) for message in failed]
+        }), 200
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# ============ RESUME TEXT EXTRACTION ============
+
+# After an application is stored its resume is parsed off the request path:
+# apply_job marks it "Resume Text Status": "pending" and wakes the extractor
+# thread, which fills "Resume Text" and the normalized "Resume Keywords".
+# PDFs are parsed with pypdf; DOCX is read with zipfile.
+RESUME_TEXT_MAX_CHARS = 100000
+RESUME_EXTRACT_POLL_INTERVAL = float(os.getenv("RESUME_EXTRACT_POLL_INTERVAL", "30"))
+RESUME_EXTRACT_CLAIM_TIMEOUT = 600
+APPLICATION_SEARCH_PAGE_MAX = 50
+
+# Weighted text index over the searchable candidate fields
+APPLICATIONS_TEXT_WEIGHTS = {
+    "Resume Keywords": 10,
+    "Skills": 8,
+    "Position": 3,
+    "Resume Text": 1
+}
+
+# Spelling variants folded into one keyword
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node",
+    "node.js": "node",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "springboot": "spring-boot",
+    "ml": "machine-learning",
+    "py": "python"
+}
+
+# Multi-word skills kept as one keyword
+SKILL_PHRASES = {
+    ("spring", "boot"): "spring-boot",
+    ("machine", "learning"): "machine-learning",
+    ("deep", "learning"): "deep-learning",
+    ("data", "science"): "data-science",
+    ("power", "bi"): "power-bi",
+    ("react", "native"): "react-native",
+    ("rest", "api"): "rest-api",
+    ("computer", "vision"): "computer-vision"
+}
+
+KEYWORD_STOPWORDS = frozenset("""
+a an and are as at be by for from has have i in is it my of on or our the to was we were will with
+you your me am this that these those using used use also etc into over per via
+""".split())
+
+_KEYWORD_TOKEN = None
+_extract_wakeup = threading.Event()
+_extract_thread = None
+_extract_thread_lock = threading.Lock()
+
+def normalize_keywords(text):
+    """Lowercased, de-duplicated keywords with aliases and known phrases folded"""
+    global _KEYWORD_TOKEN
+    if not text:
+        return []
+    if _KEYWORD_TOKEN is None:
+        import re
+        # Keeps tokens like c++, c#, node.js and ci/cd together
+        _KEYWORD_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+    tokens = []
+    for token in _KEYWORD_TOKEN.findall(text.lower()):
+        token = token.rstrip("./-")
+        if token and token not in KEYWORD_STOPWORDS and not token.isdigit():
+            tokens.append(SKILL_ALIASES.get(token, token))
+
+    keywords = []
+    seen = set()
+    skip = False
+    for idx, token in enumerate(tokens):
+        if skip:
+            skip = False
+            continue
+        phrase = SKILL_PHRASES.get((token, tokens[idx + 1])) if idx + 1 < len(tokens) else None
+        if phrase:
+            token, skip = phrase, True
+        if token not in seen:
+            seen.add(token)
+            keywords.append(token)
+    return keywords
+
+def extract_resume_text(grid_file):
+    """
+    Plain text of a PDF or DOCX resume read from GridFS, or None when the
+    format is not supported here (.doc).
+    """
+    content_type = grid_file.content_type or ''
+    if stored_codec(grid_file):
+        # The parsers seek around; resumes are small enough to inflate in memory
+        grid_file = io.BytesIO(open_stored_file(grid_file).read())
+    if content_type == 'application/pdf':
+        from pypdf import PdfReader
+        reader = PdfReader(grid_file)
+        parts = []
+        size = 0
+        for page in reader.pages:
+            text = page.extract_text() or ''
+            parts.append(text)
+            size += len(text)
+            if size >= RESUME_TEXT_MAX_CHARS:
+                break
+        return "\n".join(parts)
+
+    if content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
+        import zipfile
+        from xml.etree import ElementTree
+        namespace = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+        with zipfile.ZipFile(grid_file) as docx:
+            root = ElementTree.fromstring(docx.read("word/document.xml"))
+        paragraphs = []
+        for paragraph in root.iter(f"{namespace}p"):
+            paragraphs.append("".join(node.text or '' for node in paragraph.iter(f"{namespace}t")))
+        return "\n".join(paragraphs)
+
+    return None
+
+def process_resume_text(db, application):
+    """Extract and store the text and keywords of one application's resume"""
+    update = {"Resume Text At": datetime.now()}
+    try:
+        grid_file = gridfs.GridFS(db).find_one({"_id": ObjectId(application["Resume File ID"])})
+        text = extract_resume_text(grid_file) if grid_file else None
+        if text is None:
+            update["Resume Text Status"] = "unsupported" if grid_file else "failed"
+        else:
+            text = " ".join(text.split())[:RESUME_TEXT_MAX_CHARS]
+            update.update({"Resume Text": text, "Resume Text Status": "done"})
+        keywords = normalize_keywords(f"{application.get('Skills') or ''} {text or ''}")
+        update["Resume Keywords"] = keywords
+    except Exception as e:
+        print(f"[WARNING] Resume text extraction failed for application {application.get('ID')}: {e}")
+        update.update({"Resume Text Status": "failed", "Resume Text Error": str(e)})
+
+    db['applications'].update_one({"_id": application["_id"]}, {"$set": update})
+    return update["Resume Text Status"]
+
+def drain_resume_text(db):
+    """Process pending applications one at a time; returns how many were handled"""
+    handled = 0
+    while True:
+        now = datetime.now()
+        application = db['applications'].find_one_and_update(
+            {"$or": [
+                {"Resume Text Status": "pending"},
+                {"Resume Text Status": "processing",
+                 "Resume Text Claimed At": {"$lt": now - timedelta(seconds=RESUME_EXTRACT_CLAIM_TIMEOUT)}}
+            ]},
+            {"$set": {"Resume Text Status": "processing", "Resume Text Claimed At": now}},
+            projection={"ID": 1, "Skills": 1, "Resume File ID": 1}
+        )
+        if application is None:
+            return handled
+        process_resume_text(db, application)
+        handled += 1
+
+def _extract_loop():
+    while True:
+        _extract_wakeup.wait(RESUME_EXTRACT_POLL_INTERVAL)
+        _extract_wakeup.clear()
+        try:
+            handled = drain_resume_text(get_db())
+            if handled:
+                print(f"[OK] Extracted text from {handled} resume(s)")
+        except Exception as e:
+            print(f"[WARNING] Resume text extraction loop failed: {e}")
+
+def queue_resume_extraction():
+    """Start the extractor thread once per process and wake it"""
+    global _extract_thread
+    with _extract_thread_lock:
+        if _extract_thread is None or not _extract_thread.is_alive():
+            _extract_thread = threading.Thread(target=_extract_loop, name="resume-text", daemon=True)
+            _extract_thread.start()
+    _extract_wakeup.set()
+
+def _reset_extractor_after_fork():
+    global _extract_thread, _extract_thread_lock
+    _extract_thread = None
+    _extract_thread_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_extractor_after_fork)
+
+def create_applications_text_index(db):
+    db['applications'].create_index(
+        [(field, "text") for field in APPLICATIONS_TEXT_WEIGHTS],
+        weights=APPLICATIONS_TEXT_WEIGHTS,
+        name="applications_text_search",
+        default_language="none"
+    )
+
+@app.route("/api/admin/applications/extract-text", methods=["POST"])
+@token_required
+def queue_resume_text_route():
+    """
+    Queue text extraction for applications that have not been processed.
+    {"retry_failed": true} also requeues failed ones.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        statuses = [None, "failed"] if data.get("retry_failed") else [None]
+        result = get_db()['applications'].update_many(
+            {"Resume File ID": {"$exists": True}, "Resume Text Status": {"$in": statuses}},
+            {"$set": {"Resume Text Status": "pending"}}
+        )
+        queue_resume_extraction()
+        return jsonify({"message": "Text extraction queued", "queued": result.modified_count}), 202
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/admin/applications/search", methods=["GET"])
+@token_required
+def search_applications():
+    """
+    Ranked keyword search over resume text, keywords and skills.
+    ?q=kafka spring boot&match=all|any&position=&status=&page=&limit=
+    match=all (default) only returns candidates having every keyword.
+    """
+    try:
+        search_text = request.args.get('q', '').strip()
+        keywords = normalize_keywords(search_text)
+        if not keywords:
+            return jsonify({"error": "q is required"}), 400
+
+        try:
+            page = max(int(request.args.get('page', 1)), 1)
+            limit = min(max(int(request.args.get('limit', 20)), 1), APPLICATION_SEARCH_PAGE_MAX)
+        except ValueError:
+            return jsonify({"error": "page and limit must be integers"}), 400
+
+        # A hyphen inside $search would negate the following word
+        query = {"$text": {"$search": " ".join(keyword.replace("-", " ") for keyword in keywords)}}
+        if request.args.get('match', 'all') == 'all':
+            query["Resume Keywords"] = {"$all": keywords}
+        if request.args.get('position') and request.args['position'] != 'all':
+            query["Position"] = request.args['position']
+        if request.args.get('status') and request.args['status'] != 'all':
+            query["Status"] = request.args['status']
+
+        score = {"$meta": "textScore"}
+        projection = {field: 1 for field in APPLICATION_FIELDS}
+        projection.update({"score": score, "Resume Keywords": 1})
+
+        db = get_db()
+
+        def run():
+            cursor = (db['applications'].find(query, projection)
+                      .sort([("score", score), ("ID", DESCENDING)])
+                      .skip((page - 1) * limit)
+                      .limit(limit))
+            items = []
+            for application in cursor:
+                application = serialize_doc(application)
+                application["Matched Keywords"] = [
+                    keyword for keyword in keywords if keyword in application.get("Resume Keywords", [])
+                ]
+                application.pop("Resume Keywords", None)
+                items.append(application)
+            total = db['applications'].count_documents(query) if page == 1 else None
+            return items, total
+
+        try:
+            items, total = run()
+        except OperationFailure as e:
+            # IndexNotFound: the deployment never ran create_indexes()
+            if e.code != 27:
+                raise
+            create_applications_text_index(db)
+            items, total = run()
+
+        result = {"items": items, "keywords": keywords, "page": page, "limit": limit}
+        if total is not None:
+            result["total"] = total
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# ============ CANDIDATE MATCH SCORING ============
+
+# Applicants are kept as a sparse keyword matrix (CSR-style NumPy arrays)
+# that is extended with new or re-extracted applications instead of being
+# rebuilt. A job is scored against every row in one pass: TF-IDF weights,
+# cosine similarity and top-K selection are all array operations.
+MATCH_SYNC_INTERVAL = float(os.getenv("MATCH_SYNC_INTERVAL", "5"))
+MATCH_REBUILD_INTERVAL = float(os.getenv("MATCH_REBUILD_INTERVAL", "3600"))
+# Incremental syncs look back this far past the last sync: IDs come from
+# reserved blocks, so applications do not commit in ID or timestamp order
+MATCH_SYNC_LOOKBACK = float(os.getenv("MATCH_SYNC_LOOKBACK", "120"))
+MATCH_TOP_K_MAX = 200
+MATCH_JOB_SKILL_WEIGHT = 2  # job skills count twice as much as requirements
+
+def application_terms(application):
+    return application.get("Resume Keywords") or normalize_keywords(application.get("Skills"))
+
+def job_terms(job):
+    """Job keywords with term frequencies (skills weighted over requirements)"""
+    counts = {}
+    for text, weight in (
+        (" ".join(job.get("skills") or []), MATCH_JOB_SKILL_WEIGHT),
+        (" ".join(job.get("requirements") or []), 1),
+        (job.get("title") or "", 1)
+    ):
+        for term in normalize_keywords(text):
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+class ApplicantMatrix:
+    """
+    Binary applicant x keyword matrix with document frequencies.
+    Rows are only appended; a re-extracted application gets a new row and
+    its old one is masked out. Deleted applications are dropped when the
+    top-K rows are looked up, and the whole matrix is rebuilt every
+    MATCH_REBUILD_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        import numpy as np
+        self._np = np
+        self._lock = threading.Lock()
+        self.generation = 0  # never reset, so cached scores cannot outlive a rebuild
+        self._reset()
+
+    def _reset(self):
+        np = self._np
+        self.vocabulary = {}
+        self.positions = {}
+        self.indices = np.zeros(0, dtype=np.int32)   # column of each entry
+        self.entry_rows = np.zeros(0, dtype=np.int32)  # row of each entry
+        self.row_ids = np.zeros(0, dtype=np.int64)    # application ID per row
+        self.row_positions = np.zeros(0, dtype=np.int32)
+        self.active = np.zeros(0, dtype=bool)
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.row_of_id = {}
+        self.text_at_of_id = {}  # "Resume Text At" each ID's row was built from
+        self.synced_at = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+
+    def _column(self, term):
+        column = self.vocabulary.get(term)
+        if column is None:
+            column = self.vocabulary[term] = len(self.vocabulary)
+        return column
+
+    def _append(self, applications):
+        np = self._np
+        indices, entry_rows, row_ids, row_positions = [], [], [], []
+        first_row = len(self.row_ids)
+        retired = []
+
+        for offset, application in enumerate(applications):
+            row = first_row + offset
+            previous = self.row_of_id.get(application["ID"])
+            if previous is not None:
+                retired.append(previous)
+            self.row_of_id[application["ID"]] = row
+            self.text_at_of_id[application["ID"]] = application.get("Resume Text At")
+            columns = {self._column(term) for term in application_terms(application)}
+            indices.extend(columns)
+            entry_rows.extend([row] * len(columns))
+            row_ids.append(application["ID"])
+            position = application.get("Position") or ""
+            row_positions.append(self.positions.setdefault(position, len(self.positions)))
+
+        indices = np.array(indices, dtype=np.int32)
+        self.indices = np.concatenate([self.indices, indices])
+        self.entry_rows = np.concatenate([self.entry_rows, np.array(entry_rows, dtype=np.int32)])
+        self.row_ids = np.concatenate([self.row_ids, np.array(row_ids, dtype=np.int64)])
+        self.row_positions = np.concatenate([self.row_positions, np.array(row_positions, dtype=np.int32)])
+        self.active = np.concatenate([self.active, np.ones(len(row_ids), dtype=bool)])
+
+        doc_freq = np.zeros(len(self.vocabulary), dtype=np.int64)
+        doc_freq[:len(self.doc_freq)] = self.doc_freq
+        doc_freq += np.bincount(indices, minlength=len(self.vocabulary))
+        if retired:
+            retired = np.array(retired, dtype=np.int32)
+            self.active[retired] = False
+            # Entries of retired rows no longer count towards document frequency
+            stale = np.isin(self.entry_rows, retired)
+            doc_freq -= np.bincount(self.indices[stale], minlength=len(self.vocabulary))
+        self.doc_freq = doc_freq
+
+    def sync(self, db):
+        """Full rebuild when due, otherwise append new and re-extracted applications"""
+        with self._lock:
+            now = time.monotonic()
+            if self.built_at and now - self.checked_at < MATCH_SYNC_INTERVAL:
+                return self
+            self.checked_at = now
+
+            projection = {"ID": 1, "Position": 1, "Skills": 1, "Resume Keywords": 1, "Resume Text At": 1}
+            rebuild = not self.built_at or not self.synced_at or now - self.built_at > MATCH_REBUILD_INTERVAL
+            if rebuild:
+                self._reset()
+                self.checked_at = self.built_at = now
+                query = {}
+            else:
+                # Insert and extraction time watermarks, not the highest ID
+                since = self.synced_at - timedelta(seconds=MATCH_SYNC_LOOKBACK)
+                query = {"$or": [{"Created At": {"$gte": since}}, {"Resume Text At": {"$gte": since}}]}
+
+            synced_at = datetime.now()
+            applications = [
+                application for application in db['applications'].find(query, projection).sort("ID", 1)
+                if application["ID"] not in self.row_of_id
+                or application.get("Resume Text At") != self.text_at_of_id.get(application["ID"])
+            ]
+            if applications or rebuild:
+                self._append(applications)
+                self.generation += 1
+            self.synced_at = synced_at
+            return self
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "vocabulary": self.vocabulary,
+                "positions": self.positions,
+                "indices": self.indices,
+                "entry_rows": self.entry_rows,
+                "row_ids": self.row_ids,
+                "row_positions": self.row_positions,
+                "active": self.active,
+                "doc_freq": self.doc_freq,
+                "generation": self.generation
+            }
+
+def score_applicants(snapshot, terms, position=None):
+    """
+    Cosine similarity between the job's TF-IDF vector and every applicant
+    row. Returns (scores, candidate mask) as arrays over the rows.
+    """
+    import numpy as np
+
+    rows = len(snapshot["row_ids"])
+    vocabulary = snapshot["vocabulary"]
+    mask = snapshot["active"].copy()
+    if position is not None:
+        code = snapshot["positions"].get(position)
+        mask &= snapshot["row_positions"] == (code if code is not None else -1)
+
+    n_docs = max(int(snapshot["active"].sum()), 1)
+    idf = np.log((1 + n_docs) / (1 + snapshot["doc_freq"])) + 1.0
+
+    # Job vector over the shared vocabulary (unknown terms cannot match anyone)
+    query = np.zeros(len(vocabulary))
+    for term, count in terms.items():
+        column = vocabulary.get(term)
+        if column is not None:
+            query[column] = count * idf[column]
+    query_norm = np.linalg.norm(query)
+    if not query_norm or not rows:
+        return np.zeros(rows), mask
+    query /= query_norm
+
+    indices = snapshot["indices"]
+    entry_rows = snapshot["entry_rows"]
+    entry_idf = idf[indices]
+    row_norms = np.sqrt(np.bincount(entry_rows, weights=entry_idf ** 2, minlength=rows))
+    dots = np.bincount(entry_rows, weights=query[indices] * entry_idf, minlength=rows)
+    scores = np.divide(dots, row_norms, out=np.zeros(rows), where=row_norms > 0)
+    scores[~mask] = 0.0
+    return scores, mask
+
+def top_k_rows(scores, mask, k):
+    """Row numbers of the k best scores (descending), ignoring masked and zero rows"""
+    import numpy as np
+
+    candidates = np.flatnonzero(mask & (scores > 0))
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+_applicant_matrix = None
+_applicant_matrix_lock = threading.Lock()
+
+def get_applicant_matrix(db):
+    global _applicant_matrix
+    with _applicant_matrix_lock:
+        if _applicant_matrix is None:
+            _applicant_matrix = ApplicantMatrix()
+    return _applicant_matrix.sync(db)
+
+# Per-job score vectors, valid for one matrix generation
+match_scores_cache = TTLCache(
+    maxsize=int(os.getenv("MATCH_CACHE_SIZE", "64")),
+    ttl=float(os.getenv("MATCH_CACHE_TTL", "300"))
+)
+
+@app.route("/api/admin/jobs/<int:job_id>/ranked-applicants", methods=["GET"])
+@token_required
+def ranked_applicants(job_id):
+    """
+    Applicants ranked by keyword similarity to the job's skills and
+    requirements. ?limit=K (default 20) &scope=job|all
+    scope=job (default) ranks people who applied for this job's title,
+    scope=all ranks every applicant.
+    """
+    try:
+        started = time.perf_counter()
+        limit = min(max(request.args.get('limit', 20, type=int), 1), MATCH_TOP_K_MAX)
+        scope = request.args.get('scope', 'job')
+        if scope not in ('job', 'all'):
+            return jsonify({"error": "scope must be 'job' or 'all'"}), 400
+
+        db = get_db()
+        job = db['jobs'].find_one({"id": job_id}, {"title": 1, "skills": 1, "requirements": 1})
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        terms = job_terms(job)
+        if not terms:
+            return jsonify({"error": "Job has no skills or requirements to match against"}), 400
+
+        snapshot = get_applicant_matrix(db).snapshot()
+        position = job.get("title") if scope == 'job' else None
+        scores, mask = match_scores_cache.get_or_load(
+            (job_id, scope, snapshot["generation"], tuple(sorted(terms.items()))),
+            lambda: score_applicants(snapshot, terms, position)
+        )
+
+        # Ask for a few extra rows in case some applications were deleted
+        rows = top_k_rows(scores, mask, limit + 10)
+        ids = [int(snapshot["row_ids"][row]) for row in rows]
+        projection = {"ID": 1, "Name": 1, "Email": 1, "Position": 1, "Status": 1, "Skills": 1, "Resume Keywords": 1}
+        found = {a["ID"]: a for a in db['applications'].find({"ID": {"$in": ids}}, projection)}
+
+        items = []
+        for row, app_id in zip(rows, ids):
+            application = found.get(app_id)
+            if application is None:
+                continue
+            keywords = set(application_terms(application))
+            application.pop("Resume Keywords", None)
+            application = serialize_doc(application)
+            application["score"] = round(float(scores[row]), 4)
+            application["matched_skills"] = [term for term in terms if term in keywords]
+            items.append(application)
+            if len(items) == limit:
+                break
+
+        return jsonify({
+            "job_id": job_id,
+            "title": job.get("title"),
+            "scope": scope,
+            "candidates": int(mask.sum()),
+            "items": items,
+            "took_ms": round((time.perf_counter() - started) * 1000, 1)
+        }), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# ============ MIGRATION HELPER (Optional) ============
+
+# Moving local resumes into GridFS runs as a background job. Uploads go
+# through a bounded thread pool; application updates are written with one
+# bulk_write per batch and progress is kept in migration_checkpoints.
+GRIDFS_MIGRATION_ID = "local-to-gridfs"
+GRIDFS_MIGRATION_WORKERS = int(os.getenv("GRIDFS_MIGRATION_WORKERS", "4"))
+GRIDFS_MIGRATION_BATCH_SIZE = int(os.getenv("GRIDFS_MIGRATION_BATCH_SIZE", "100"))
+GRIDFS_MIGRATION_MAX_ERRORS = 50  # most recent failures kept in the progress document
+
+def migrate_resume_file(fs, application):
+    """
+    Stream one application's local resume into GridFS.
+    Returns (status, file_id, size) with status "migrated", "missing" or
+    "existing" (uploaded by an earlier, interrupted run).
+    """
+    resume_path = application.get('Resume Path')
+    if not resume_path or not os.path.exists(resume_path):
+        return "missing", None, 0
+
+    # A previous run may have uploaded the file but died before the
+    # application update was written
+    existing = fs.find_one({"metadata.application_id": application['_id']})
+    if existing is not None:
+        return "existing", existing._id, existing.length
+
+    with open(resume_path, 'rb') as f:
+        content_type = sniff_resume_type(f.read(1024)) or 'application/pdf'
+        f.seek(0)
+        file_id = fs.put(
+            f,
+            filename=application.get('Resume File'),
+            content_type=content_type,
+            chunk_size=RESUME_CHUNK_SIZE,
+            upload_date=application.get('Created At', datetime.now()),
+            metadata={
+                'original_filename': application.get('Resume File'),
+                'applicant_email': application.get('Email'),
+                'application_id': application['_id'],
+                'migrated': True
+            }
+        )
+    return "migrated", file_id, os.path.getsize(resume_path)
+
+def gridfs_migration_progress(db):
+    """Progress document with throughput and ETA, or None if never run"""
+    progress = db['migration_checkpoints'].find_one({"_id": GRIDFS_MIGRATION_ID})
+    if progress is None:
+        return None
+    progress.pop('_id', None)
+
+    end = progress.get('finished_at') or datetime.now()
+    elapsed = max((end - progress['started_at']).total_seconds(), 0.001)
+    done = progress.get('migrated', 0) + progress.get('failed', 0) + progress.get('missing', 0)
+    remaining = max(progress.get('total', 0) - done, 0)
+    files_per_second = done / elapsed
+
+    progress['processed'] = done
+    progress['remaining'] = remaining
+    progress['elapsed_seconds'] = round(elapsed, 1)
+    progress['files_per_second'] = round(files_per_second, 2)
+    progress['bytes_per_second'] = round(progress.get('bytes', 0) / elapsed)
+    progress['eta_seconds'] = (
+        round(remaining / files_per_second) if progress.get('status') == "running" and files_per_second else None
+    )
+    return progress
+
+def run_gridfs_migration(db, workers=GRIDFS_MIGRATION_WORKERS, batch_size=GRIDFS_MIGRATION_BATCH_SIZE, report=None):
+    from concurrent.futures import ThreadPoolExecutor
+
+    applications_collection = db['applications']
+    checkpoints = db['migration_checkpoints']
+    fs = gridfs.GridFS(db)
+    db['fs.files'].create_index("metadata.application_id", sparse=True)
+
+    # Migrated applications lose "Resume Path", so a rerun only sees what is left
+    pending = {"Resume Path": {"$exists": True}}
+    total = applications_collection.count_documents(pending)
+    processed = 0
+    checkpoints.replace_one({"_id": GRIDFS_MIGRATION_ID}, {
+        "status": "running",
+        "started_at": datetime.now(),
+        "updated_at": datetime.now(),
+        "total": total,
+        "migrated": 0,
+        "missing": 0,
+        "failed": 0,
+        "bytes": 0,
+        "errors": []
+    }, upsert=True)
+
+    projection = {"Resume Path": 1, "Resume File": 1, "Email": 1, "Created At": 1, "ID": 1}
+    cursor = applications_collection.find(pending, projection).batch_size(batch_size)
+
+    def upload(application):
+        try:
+            return application, migrate_resume_file(fs, application), None
+        except Exception as e:
+            return application, None, e
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gridfs-migrate") as executor:
+        while True:
+            batch = [application for _, application in zip(range(batch_size), cursor)]
+            if not batch:
+                break
+
+            updates = []
+            inc = {"migrated": 0, "missing": 0, "failed": 0, "bytes": 0}
+            errors = []
+            for application, result, error in executor.map(upload, batch):
+                if error is not None:
+                    inc["failed"] += 1
+                    errors.append({"ID": application.get('ID'), "error": str(error)})
+                    print(f"[FAILED] Migration error for app {application.get('ID')}: {error}")
+                    continue
+                status, file_id, size = result
+                if status == "missing":
+                    inc["missing"] += 1
+                    continue
+                inc["migrated"] += 1
+                inc["bytes"] += size
+                updates.append(UpdateOne(
+                    {"_id": application['_id']},
+                    {
+                        "$set": {
+                            "Resume File ID": str(file_id),
+                            "Migrated to GridFS": True
+                        },
+                        "$unset": {"Resume Path": ""}
+                    }
+                ))
+
+            if updates:
+                applications_collection.bulk_write(updates, ordered=False)
+            progress_update = {"$inc": inc, "$set": {"updated_at": datetime.now()}}
+            if errors:
+                progress_update["$push"] = {"errors": {"$each": errors, "$slice": -GRIDFS_MIGRATION_MAX_ERRORS}}
+            checkpoints.update_one({"_id": GRIDFS_MIGRATION_ID}, progress_update)
+            processed += len(batch)
+            if report:
+                report(processed, total)
+            print(f"[MIGRATED] {inc['migrated']} resumes -> GridFS ({inc['missing']} missing, {inc['failed']} failed)")
+
+    checkpoints.update_one(
+        {"_id": GRIDFS_MIGRATION_ID},
+        {"$set": {"status": "completed", "finished_at": datetime.now(), "updated_at": datetime.now()}}
+    )
+    return gridfs_migration_progress(db)
+
+@background_job("gridfs_migration", unique=True)
+def gridfs_migration_job(db, params, report):
+    try:
+        progress = run_gridfs_migration(db, report=report)
+    except Exception as e:
+        db['migration_checkpoints'].update_one(
+            {"_id": GRIDFS_MIGRATION_ID},
+            {"$set": {"status": "failed", "error": str(e), "finished_at": datetime.now()}}
+        )
+        raise
+    return {key: progress[key] for key in ("total", "migrated", "missing", "failed", "bytes")}
+
+@app.route("/admin/migrate-local-to-gridfs", methods=["POST"])
+@token_required
+def migrate_local_to_gridfs():
+    """
+    Move existing local resume files to GridFS as a background job.
+    Safe to call again: files that were already migrated are skipped.
+    Poll /admin/migrate-local-to-gridfs/status for progress.
+    """
+    try:
+        db = get_db()
+        job, started = submit_background_job(db, "gridfs_migration")
+        return jsonify({
+            "message": "Migration started" if started else "Migration already running",
+            "job": serialize_background_job(job),
+            "progress": gridfs_migration_progress(db)
+        }), 202 if started else 409
+
+    except BackgroundQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/admin/migrate-local-to-gridfs/status", methods=["GET"])
+@token_required
+def migrate_local_to_gridfs_status():
+    """Progress, throughput and ETA of the local-to-GridFS migration"""
+    try:
+        progress = gridfs_migration_progress(get_db())
+        if progress is None:
+            return jsonify({"status": "not_started"}), 200
+        return jsonify(progress), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# Compress resumes stored before compression at rest (or with it turned
+# off). Each file keeps its _id: its chunks and length are swapped in one
+# transaction where available. Files that would not shrink are marked
+# codec "none" so later runs skip them.
+RESUME_RECOMPRESS_BATCH_SIZE = int(os.getenv("RESUME_RECOMPRESS_BATCH_SIZE", "50"))
+
+def recompress_resume_file(db, file_doc):
+    """Compress one stored resume in place; returns the bytes saved (0 if skipped)"""
+    files = db['fs.files']
+    grid_file = gridfs.GridFS(db).get(file_doc["_id"])
+    raw = grid_file.read()
+
+    codec = choose_resume_codec(raw[:RESUME_COMPRESSION_SAMPLE])
+    data = None
+    if codec:
+        compressor = resume_compressor(codec)
+        data = compressor.compress(raw) + compressor.flush()
+    if data is None or len(data) > len(raw) * (1 - RESUME_COMPRESSION_MIN_SAVING):
+        files.update_one(
+            {"_id": file_doc["_id"]},
+            {"$set": {"metadata.codec": "none", "metadata.raw_length": len(raw)}}
+        )
+        return 0
+
+    chunk_size = file_doc.get("chunkSize") or RESUME_CHUNK_SIZE
+    chunks = [
+        {"files_id": file_doc["_id"], "n": n, "data": Binary(data[offset:offset + chunk_size])}
+        for n, offset in enumerate(range(0, len(data), chunk_size))
+    ]
+
+    # Chunks are replaced delete-then-insert under the same files_id, which
+    # is only safe inside a transaction (see recompress_resumes)
+    def swap(session):
+        db['fs.chunks'].delete_many({"files_id": file_doc["_id"]}, session=session)
+        db['fs.chunks'].insert_many(chunks, session=session)
+        files.update_one(
+            {"_id": file_doc["_id"]},
+            {"$set": {"length": len(data), "metadata.codec": codec, "metadata.raw_length": len(raw)}},
+            session=session
+        )
+    run_in_transaction(db, swap)
+    return len(raw) - len(data)
+
+def recompress_resumes(db, batch_size=RESUME_RECOMPRESS_BATCH_SIZE, report=None):
+    """
+    Compress every uncompressed resume in GridFS, batch by batch. Refuses to
+    run without transactions: a crash between deleting the old chunks and
+    inserting the new ones would lose the only copy of a resume.
+    """
+    if not transactions_supported(db.client):
+        raise RuntimeError("Recompressing resumes needs a replica set (multi-document transactions)")
+    resume_types = [content_type for _, content_type in RESUME_SIGNATURES]
+    query = {"metadata.codec": {"$exists": False}, "contentType": {"$in": resume_types}}
+    total = db['fs.files'].count_documents(query)
+    summary = {"total": total, "processed": 0, "compressed": 0, "skipped": 0, "failed": 0, "saved_bytes": 0}
+
+    last_id = None
+    while True:
+        batch_query = dict(query, _id={"$gt": last_id}) if last_id else query
+        batch = list(db['fs.files'].find(batch_query, {"chunkSize": 1}).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+        for file_doc in batch:
+            try:
+                saved = recompress_resume_file(db, file_doc)
+                summary["compressed" if saved else "skipped"] += 1
+                summary["saved_bytes"] += saved
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"[WARNING] Could not recompress GridFS file {file_doc['_id']}: {e}")
+        last_id = batch[-1]["_id"]
+        summary["processed"] += len(batch)
+        if report:
+            report(summary["processed"], total)
+        print(f"[OK] Recompressed {summary['processed']}/{total} resumes ({summary['saved_bytes']} bytes saved)")
+    return summary
+
+@background_job("resume_recompress", unique=True)
+def resume_recompress_job(db, params, report):
+    return recompress_resumes(db, int(params.get("batch_size") or RESUME_RECOMPRESS_BATCH_SIZE), report)
+
+# ============ PROCESS STARTUP ============
+
+# Index checks, backfills and worker threads run once per process in a
+# background thread, so no request waits on them. Production entry points
+# (serve_production.py, wsgi.py, api/index.py) call start_background_workers()
+# at import; the first non-health request starts it on any other server.
+STARTUP_RETRY_SECONDS = int(os.getenv("STARTUP_RETRY_SECONDS", "30"))
+
+_startup_thread = None
+_startup_lock = threading.Lock()
+
+def run_startup_steps():
+    """Run every startup step, retrying the failed ones until all succeed"""
+    pending = [create_indexes, ensure_interview_times, ensure_background_jobs_recovered,
+               start_outbox_dispatcher, queue_resume_extraction]
+    while True:
+        failed = []
+        for step in pending:
+            try:
+                if step() is False:
+                    failed.append(step)
+            except Exception as e:
+                print(f"[WARNING] Startup step {step.__name__} failed: {e}")
+                failed.append(step)
+        if not failed:
+            print("[OK] Startup tasks finished")
+            return
+        pending = failed
+        print(f"[WARNING] Retrying {len(pending)} startup step(s) in {STARTUP_RETRY_SECONDS}s")
+        time.sleep(STARTUP_RETRY_SECONDS)
+
+def start_background_workers():
+    """Start the startup thread once per process; returns immediately"""
+    global _startup_thread
+    if _startup_thread is not None:
+        return
+    with _startup_lock:
+        if _startup_thread is None:
+            _startup_thread = threading.Thread(target=run_startup_steps, name="startup", daemon=True)
+            _startup_thread.start()
+
+@app.before_request
+def start_background_workers_on_first_request():
+    if not request.path.startswith("/api/health"):
+        start_background_workers()
+
+def _reset_startup_after_fork():
+    # The parent's startup thread does not survive a fork
+    global _startup_thread, _startup_lock
+    _startup_thread = None
+    _startup_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_startup_after_fork)
 
 # ============ MAIN ============
 
@@ -1007,7 +4301,7 @@ if __name__ == "__main__":
         resume_count = fs_files.count_documents({})
         print(f"[GRIDFS] Resumes stored: {resume_count}")
         
-        create_indexes()
+        start_background_workers()
         
         print("\n[*] Starting Flask server...")
         print("="*60 + "\n")
@@ -1,130 +1,308 @@
 """
 Excel to MongoDB Migration Script
 Run this once to transfer existing data from students_data.xlsx to MongoDB
+
+The sheet is streamed in chunks (read-only openpyxl), converted per chunk
+with pandas and written with unordered insert_many batches. The last
+processed row is checkpointed in MongoDB, so re-running after an
+interruption resumes where it stopped. Rows without an ID get new IDs from
+the app's counters collection, and the counter is raised past every
+migrated ID afterwards.
+
+Usage:
+    python migrate_to_mongodb.py [--batch-size 1000] [--dry-run] [--restart]
+                                 [--mode append|replace] [--file students_data.xlsx]
 """
 
+import argparse
+import time
 import pandas as pd
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from app import reserve_ids, sync_id_counter
 
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 EXCEL_FILE = "students_data.xlsx"
+RESUME_DIR = "uploads/resumes"
+
+def read_chunks(excel_file, batch_size, start_row=0):
+    """
+    Yield DataFrame chunks from the first sheet, indexed by row number.
+    Row numbers are 1-based data rows (the header is not counted).
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name).strip() if name is not None else f"Column {idx}" for idx, name in enumerate(header, 1)]
+
+        chunk = []
+        for row_number, values in enumerate(rows, 1):
+            if row_number <= start_row:
+                continue
+            if all(value is None for value in values):
+                continue
+            chunk.append((row_number, values))
+            if len(chunk) >= batch_size:
+                yield to_frame(chunk, columns)
+                chunk = []
+        if chunk:
+            yield to_frame(chunk, columns)
+    finally:
+        wb.close()
+
+def to_frame(chunk, columns):
+    row_numbers = [row_number for row_number, _ in chunk]
+    df = pd.DataFrame([values for _, values in chunk], columns=columns)
+    df.index = row_numbers
+    return df
+
+def sheet_ids(df):
+    """The chunk's ID column as floats, NaN where a row has no numeric ID"""
+    if 'ID' not in df.columns:
+        return pd.Series(float('nan'), index=df.index)
+    return pd.to_numeric(df['ID'], errors='coerce')
+
+def as_int_column(values):
+    """Numeric Series as Python ints, None where missing (object dtype keeps them ints)"""
+    return pd.Series([int(value) if pd.notna(value) else None for value in values], index=values.index, dtype=object)
+
+def prepare_records(df, allocate_ids=None):
+    """
+    Vectorized clean-up of one chunk; returns (last_row_number, records).
+    Rows without an ID get a block from allocate_ids(row_numbers), which
+    returns the first ID of the block; without it they keep ID None.
+    """
+    ids = sheet_ids(df)
+
+    # Convert NaN to None in one pass
+    df = df.astype(object).where(pd.notna(df), None)
+
+    # IDs are stored as integers, like the ones the app allocates
+    missing = ids.isna()
+    if missing.any() and allocate_ids is not None:
+        first = allocate_ids([int(row) for row in df.index[missing]])
+        ids.loc[missing] = list(range(first, first + int(missing.sum())))
+    df['ID'] = as_int_column(ids)
+
+    # Chunks with a gap would otherwise hold float years (NaN promotion)
+    if 'Passout Year' in df.columns:
+        df['Passout Year'] = as_int_column(pd.to_numeric(df['Passout Year'], errors='coerce'))
+
+    # Ensure Status exists
+    if 'Status' not in df.columns:
+        df['Status'] = 'Pending'
+    else:
+        df['Status'] = df['Status'].where(df['Status'].notna(), 'Pending')
+
+    # Handle resume file path
+    if 'Resume File' in df.columns:
+        has_file = df['Resume File'].notna()
+        df['Resume Path'] = None
+        df.loc[has_file, 'Resume Path'] = RESUME_DIR + "/" + df.loc[has_file, 'Resume File'].astype(str)
+
+    records = df.to_dict('records')
+    created_at = datetime.now()
+    for record in records:
+        # Add metadata
+        record['Created At'] = created_at
+        if record.get('Resume Path') is None:
+            record.pop('Resume Path', None)
+    return int(df.index[-1]), records
+
+def checkpoint_id(excel_file):
+    return f"excel:{os.path.basename(excel_file)}"
+
+def max_sheet_id(excel_file, batch_size):
+    highest = 0
+    for df in read_chunks(excel_file, batch_size):
+        chunk_max = sheet_ids(df).max()
+        if pd.notna(chunk_max):
+            highest = max(highest, int(chunk_max))
+    return highest
+
+def id_allocator(db, excel_file, batch_size, checkpoints):
+    """
+    allocate_ids callback for prepare_records. The counter is first raised
+    above every ID in the sheet, so new IDs never collide with rows still to
+    come. Each reserved block is saved in the checkpoint before its chunk is
+    inserted, so a chunk re-sent after an interruption gets the same IDs
+    (and is skipped as already present) instead of being inserted twice.
+    """
+    seeded = False
+
+    def allocate_ids(rows):
+        nonlocal seeded
+        checkpoint = checkpoints.find_one({"_id": checkpoint_id(excel_file)}, {"pending_ids": 1}) or {}
+        pending = checkpoint.get("pending_ids")
+        if pending and pending.get("rows") == rows:
+            return pending["first"]
+        if not seeded:
+            sync_id_counter(db, "applications", max_sheet_id(excel_file, batch_size))
+            seeded = True
+        first = reserve_ids(db, "applications", len(rows))
+        checkpoints.update_one(
+            {"_id": checkpoint_id(excel_file)},
+            {"$set": {"pending_ids": {"rows": rows, "first": first}}},
+            upsert=True
+        )
+        return first
+
+    return allocate_ids
+
+def dry_run(excel_file, batch_size):
+    print(f"🧪 Dry run: reading {excel_file} in batches of {batch_size} (nothing is written)\n")
+    started = time.perf_counter()
+    total = 0
+    batches = 0
+    missing_resumes = 0
+    missing_ids = 0
+
+    for df in read_chunks(excel_file, batch_size):
+        _, records = prepare_records(df)
+        total += len(records)
+        batches += 1
+        missing_resumes += sum(1 for r in records if r.get('Resume Path') and not os.path.exists(r['Resume Path']))
+        missing_ids += sum(1 for r in records if r['ID'] is None)
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0
+    print("="*60)
+    print("   🧪 DRY RUN REPORT")
+    print("="*60)
+    print(f"Rows read and converted: {total}")
+    print(f"Batches: {batches} (batch size {batch_size})")
+    print(f"Missing resume files: {missing_resumes}")
+    print(f"Rows without an ID (given new IDs on migration): {missing_ids}")
+    print(f"Elapsed: {elapsed:.2f}s")
+    print(f"Throughput: {rate:,.0f} rows/s")
+    print("="*60 + "\n")
 
-def migrate_data():
+def migrate_data(excel_file=EXCEL_FILE, batch_size=1000, restart=False, mode=None):
     print("\n" + "="*60)
     print("   EXCEL TO MONGODB MIGRATION")
     print("="*60 + "\n")
-    
+
     # Check if Excel file exists
-    if not os.path.exists(EXCEL_FILE):
-        print(f"❌ {EXCEL_FILE} not found!")
+    if not os.path.exists(excel_file):
+        print(f"❌ {excel_file} not found!")
         print("✅ No existing data to migrate. Starting with empty database.\n")
         return
-    
+
+    client = None
     try:
         print("📡 Connecting to MongoDB...")
         client = MongoClient(MONGO_URI)
         db = client['job_portal']
         collection = db['applications']
-        
+        checkpoints = db['migration_checkpoints']
+
         # Test connection
         client.server_info()
         print("✅ Connected to MongoDB!\n")
-        
-        # Read Excel file
-        print(f"📖 Reading data from {EXCEL_FILE}...")
-        df = pd.read_excel(EXCEL_FILE)
-        print(f"✅ Found {len(df)} records in Excel\n")
-        
-        if len(df) == 0:
-            print("⚠️ Excel file is empty. No data to migrate.\n")
-            return
-        
-        # Check for existing data
-        existing_count = collection.count_documents({})
-        if existing_count > 0:
-            print(f"⚠️ Database already has {existing_count} records.")
-            choice = input("What do you want to do?\n"
-                          "  1. Append new records (keep existing)\n"
-                          "  2. Replace all (DELETE existing data)\n"
-                          "  3. Cancel migration\n"
-                          "Enter choice (1/2/3): ")
-            
-            if choice == '2':
-                print("\n🗑️ Deleting existing records...")
-                collection.delete_many({})
-                print("✅ Existing records deleted\n")
-            elif choice == '3':
-                print("\n❌ Migration cancelled\n")
-                return
-            elif choice != '1':
-                print("\n❌ Invalid choice. Migration cancelled\n")
-                return
-        
-        # Convert DataFrame to records
-        records = df.to_dict('records')
-        migrated = 0
-        skipped = 0
-        
-        print("🔄 Migrating records...\n")
-        
-        for idx, record in enumerate(records, 1):
-            # Add metadata
-            record['Created At'] = datetime.now()
-            
-            # Convert NaN to None
-            for key, value in list(record.items()):
-                if pd.isna(value):
-                    record[key] = None
-            
-            # Handle resume file path
-            if 'Resume File' in record and record['Resume File']:
-                resume_path = os.path.join("uploads/resumes", record['Resume File'])
-                record['Resume Path'] = resume_path
-                
-                if not os.path.exists(resume_path):
-                    print(f"⚠️ Warning: Resume file not found - {record['Resume File']}")
-            
-            # Ensure ID exists
-            if 'ID' not in record or pd.isna(record['ID']):
-                record['ID'] = idx
-            
-            # Ensure Status exists
-            if 'Status' not in record or pd.isna(record['Status']):
-                record['Status'] = 'Pending'
-            
-            try:
-                # Insert into MongoDB
-                collection.insert_one(record)
-                migrated += 1
-                print(f"✅ [{idx}/{len(records)}] Migrated ID: {record.get('ID')} - {record.get('Name')}")
-            except Exception as e:
-                print(f"❌ [{idx}/{len(records)}] Failed: {e}")
-                skipped += 1
-        
-        # Create indexes
-        print("\n🔧 Creating database indexes...")
+
+        if restart:
+            checkpoints.delete_one({"_id": checkpoint_id(excel_file)})
+        checkpoint = checkpoints.find_one({"_id": checkpoint_id(excel_file)})
+        start_row = checkpoint['last_row'] if checkpoint else 0
+
+        if start_row:
+            print(f"⏩ Resuming after row {start_row} (checkpoint from {checkpoint['updated_at']})\n")
+        else:
+            # Check for existing data
+            existing_count = collection.estimated_document_count()
+            if existing_count > 0:
+                print(f"⚠️ Database already has {existing_count} records.")
+                choice = {'append': '1', 'replace': '2'}.get(mode) or input(
+                              "What do you want to do?\n"
+                              "  1. Append new records (keep existing)\n"
+                              "  2. Replace all (DELETE existing data)\n"
+                              "  3. Cancel migration\n"
+                              "Enter choice (1/2/3): ")
+
+                if choice == '2':
+                    print("\n🗑️ Deleting existing records...")
+                    collection.delete_many({})
+                    print("✅ Existing records deleted\n")
+                elif choice == '3':
+                    print("\n❌ Migration cancelled\n")
+                    return
+                elif choice != '1':
+                    print("\n❌ Invalid choice. Migration cancelled\n")
+                    return
+
+        # Create indexes first: the unique ID index turns rows re-sent after
+        # an interruption into duplicate-key skips instead of duplicates
+        print("🔧 Creating database indexes...")
         collection.create_index("ID", unique=True)
         collection.create_index("Email")
-        collection.create_index("Position")
-        collection.create_index("Status")
+        collection.create_index([("Position", 1), ("ID", -1)])
+        collection.create_index([("Status", 1), ("ID", -1)])
         collection.create_index([("Created At", -1)])
         print("✅ Indexes created successfully\n")
-        
+
+        print(f"🔄 Migrating records in batches of {batch_size}...\n")
+
+        started = time.perf_counter()
+        processed = 0
+        migrated = 0
+        duplicates = 0
+        skipped = 0
+
+        allocate_ids = id_allocator(db, excel_file, batch_size, checkpoints)
+        for df in read_chunks(excel_file, batch_size, start_row):
+            last_row, records = prepare_records(df, allocate_ids)
+            inserted = len(records)
+            try:
+                collection.insert_many(records, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get('writeErrors', []):
+                    inserted -= 1
+                    if error.get('code') == 11000:
+                        duplicates += 1
+                    else:
+                        skipped += 1
+                        print(f"❌ Row {df.index[error['index']]}: {error.get('errmsg')}")
+
+            migrated += inserted
+            processed += len(records)
+            checkpoints.update_one(
+                {"_id": checkpoint_id(excel_file)},
+                {"$set": {"last_row": last_row, "updated_at": datetime.now()}, "$unset": {"pending_ids": ""}},
+                upsert=True
+            )
+            rate = processed / (time.perf_counter() - started)
+            print(f"✅ Rows up to {last_row}: {migrated} migrated, {duplicates} already present ({rate:,.0f} rows/s)")
+
+        checkpoints.update_one(
+            {"_id": checkpoint_id(excel_file)},
+            {"$set": {"completed_at": datetime.now()}}
+        )
+
+        # New applications must be numbered after the migrated ones
+        sync_id_counter(db, "applications")
+
         # Summary
-        print("="*60)
+        print("\n" + "="*60)
         print("   ✅ MIGRATION COMPLETE")
         print("="*60)
-        print(f"Total records processed: {len(records)}")
+        print(f"Total records processed: {processed}")
         print(f"Successfully migrated: {migrated}")
-        print(f"Skipped/Failed: {skipped}")
-        print(f"Total in database: {collection.count_documents({})}")
+        print(f"Already present (skipped): {duplicates}")
+        print(f"Failed: {skipped}")
+        print(f"Total in database: {collection.estimated_document_count()}")
         print("="*60 + "\n")
-        
+
         # Show sample
         print("📊 Sample of migrated data:")
         sample = collection.find_one()
@@ -133,15 +311,33 @@ def migrate_data():
             print(f"   Name: {sample.get('Name')}")
             print(f"   Position: {sample.get('Position')}")
             print(f"   Status: {sample.get('Status')}\n")
-        
+
     except Exception as e:
         print(f"\n❌ Migration failed!")
-        print(f"Error: {e}\n")
+        print(f"Error: {e}")
+        print("Re-run the script to resume from the last checkpoint.\n")
         return
     finally:
-        client.close()
-        print("🔌 Database connection closed\n")
+        if client is not None:
+            client.close()
+            print("🔌 Database connection closed\n")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Migrate students_data.xlsx into MongoDB")
+    parser.add_argument("--file", default=EXCEL_FILE, help="Excel file to migrate")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert_many batch")
+    parser.add_argument("--dry-run", action="store_true", help="Read and convert only, then report throughput")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start from the first row")
+    parser.add_argument("--mode", choices=["append", "replace"], help="What to do with existing records (asks if omitted)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    migrate_data()
-    print("✨ Migration complete! You can now run: python app.py\n")
\ No newline at end of file
+    args = parse_args()
+    if args.dry_run:
+        if os.path.exists(args.file):
+            dry_run(args.file, args.batch_size)
+        else:
+            print(f"❌ {args.file} not found!\n")
+    else:
+        migrate_data(args.file, args.batch_size, args.restart, args.mode)
+        print("✨ Migration complete! You can now run: python app.py\n")
@@ -0,0 +1,47 @@
+"""
+Compress resumes already stored in GridFS (see RESUME_COMPRESSION in app.py).
+Safe to re-run: processed files are marked and skipped next time.
+The same work can be queued from the admin API as the "resume_recompress" job.
+
+Usage:
+    python recompress_resumes.py [--batch-size 50]
+"""
+
+import argparse
+from app import get_db, close_db, recompress_resumes, resume_codec, RESUME_RECOMPRESS_BATCH_SIZE
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress resumes stored in GridFS")
+    parser.add_argument("--batch-size", type=int, default=RESUME_RECOMPRESS_BATCH_SIZE, help="Files per batch")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("   RECOMPRESS STORED RESUMES")
+    print("="*60 + "\n")
+
+    if resume_codec() is None:
+        print("[ERROR] RESUME_COMPRESSION is off, nothing to do.")
+        return
+
+    try:
+        db = get_db()
+        db.client.server_info()
+        print(f"Connected. Codec: {resume_codec()}\n")
+
+        summary = recompress_resumes(db, args.batch_size)
+
+        print("\n" + "="*60)
+        print(f"Files checked: {summary['processed']}")
+        print(f"Compressed: {summary['compressed']}")
+        print(f"Left as is (would not shrink): {summary['skipped']}")
+        print(f"Failed: {summary['failed']}")
+        print(f"Saved: {summary['saved_bytes'] / (1024 * 1024):.2f} MB")
+        print("="*60 + "\n")
+    except Exception as e:
+        print(f"\n[ERROR] Recompression failed: {e}")
+    finally:
+        close_db()
+        print("Connection closed.")
+
+if __name__ == "__main__":
+    main()
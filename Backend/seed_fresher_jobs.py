@@ -1,23 +1,12 @@
-import os
-from pymongo import MongoClient
-from datetime import datetime
-from dotenv import load_dotenv
-from urllib.parse import quote_plus
-import sys
+from app import get_db, close_db, import_jobs, MONGO_CLUSTER
 
-load_dotenv()
-
-# MongoDB Configuration from .env
-MONGO_USER = os.getenv("MONGO_USER", "JobPortal")
-MONGO_PASSWORD = os.getenv("MONGO_PASSWORD", "")
-MONGO_CLUSTER = os.getenv("MONGO_CLUSTER", "jobportal.vrdkavz.mongodb.net")
-
-# Auto-encode credentials
-username = quote_plus(MONGO_USER)
-password = quote_plus(MONGO_PASSWORD)
-
-# Build connection string
-MONGO_URI = f"mongodb+srv://{username}:{password}@{MONGO_CLUSTER}/job_portal?retryWrites=true&w=majority"
+DEFAULT_RESPONSIBILITIES = [
+    "Collaborate with cross-functional teams to define and ship new features.",
+    "Write clean, maintainable, and efficient code.",
+    "Participate in code reviews and contribute to knowledge sharing.",
+    "Stay updated with emerging trends and technologies in the industry."
+]
+DEFAULT_BENEFITS = ["Competitive Pay", "Professional Mentorship", "Learning Allowances", "Flexible Working"]
 
 def seed_jobs():
     print("\n" + "="*60)
@@ -26,18 +15,12 @@ def seed_jobs():
     
     try:
         print(f"Connecting to MongoDB Cluster: {MONGO_CLUSTER}...")
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=10000)
-        db = client['job_portal']
-        jobs_collection = db['jobs']
+        db = get_db()
         
         # Test connection
-        client.server_info()
+        db.client.server_info()
         print("Connected successfully!\n")
         
-        # Get starting ID
-        last_job = jobs_collection.find_one(sort=[("id", -1)])
-        start_id = (last_job['id'] + 1) if last_job and 'id' in last_job else 1
-        
         it_fresher_jobs = [
             {
                 "title": "Java Full Stack Developer Trainee",
@@ -170,47 +153,32 @@ def seed_jobs():
             }
         ]
         
-        migrated = 0
-        for i, job_data in enumerate(it_fresher_jobs):
-            job_doc = {
-                "id": start_id + i,
-                "title": job_data["title"],
-                "company": job_data["company"],
-                "location": job_data["location"],
-                "type": job_data["type"],
-                "experience": job_data["experience"],
-                "experienceLevel": job_data.get("experienceLevel", "Fresher"),
-                "salary": job_data["salary"],
-                "postedDate": "Just now",
-                "applicants": 0,
-                "description": job_data["description"],
-                "responsibilities": job_data.get("responsibilities", [
-                    "Collaborate with cross-functional teams to define and ship new features.",
-                    "Write clean, maintainable, and efficient code.",
-                    "Participate in code reviews and contribute to knowledge sharing.",
-                    "Stay updated with emerging trends and technologies in the industry."
-                ]),
-                "requirements": job_data["requirements"],
-                "skills": job_data["skills"],
-                "benefits": ["Competitive Pay", "Professional Mentorship", "Learning Allowances", "Flexible Working"],
-                "status": "Active",
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
-            }
-            jobs_collection.insert_one(job_doc)
-            migrated += 1
-            print(f"[SUCCESS] Created: {job_data['title']} at {job_data['company']}")
+        # Same validation, ID allocation and batched insert as /api/admin/jobs/import
+        jobs = [
+            dict(
+                job_data,
+                responsibilities=job_data.get("responsibilities", DEFAULT_RESPONSIBILITIES),
+                benefits=DEFAULT_BENEFITS,
+                status="Active"
+            )
+            for job_data in it_fresher_jobs
+        ]
+        result = import_jobs(db, jobs)
+        
+        for job_data, job_id in zip(it_fresher_jobs, result["job_ids"]):
+            print(f"[SUCCESS] Created: {job_data['title']} at {job_data['company']} (ID {job_id})")
+        for error in result["errors"]:
+            print(f"[ERROR] Row {error['row']}: {error['error']}")
             
-        print(f"\nSuccessfully seeded {migrated} advanced IT fresher jobs!")
+        print(f"\nSuccessfully seeded {result['inserted']} advanced IT fresher jobs!")
         
     except Exception as e:
         import traceback
         print(f"\n[ERROR] Seeding failed: {e}")
         traceback.print_exc()
     finally:
-        if 'client' in locals():
-            client.close()
-            print("Connection closed.")
+        close_db()
+        print("Connection closed.")
 
 if __name__ == "__main__":
     seed_jobs()
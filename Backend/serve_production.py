@@ -1,8 +1,9 @@
 from waitress import serve
-from app import app
+from app import app, start_background_workers
 import os
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     print(f"Starting production server on port {port}...")
+    start_background_workers()
     serve(app, host="0.0.0.0", port=port)
@@ -1,4 +1,7 @@
-from app import app
+from app import app, start_background_workers
+
+# Index checks, backfills and worker threads (non-blocking)
+start_background_workers()
 
 if __name__ == "__main__":
     app.run()
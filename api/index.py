@@ -1,4 +1,7 @@
-from Backend.app import app
+from Backend.app import app, start_background_workers
+
+# Index checks, backfills and worker threads (non-blocking)
+start_background_workers()
 
 # Vercel serverless function entry point
 # This file is located at /api/index.py
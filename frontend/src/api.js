@@ -35,11 +35,14 @@ export const logout = () => {
 };
 
 // Submit job application (PUBLIC - No token needed)
-export const applyJob = async (formData) => {
+// Reuse the same idempotencyKey when retrying one submission so the server
+// returns the original application instead of creating a duplicate
+export const applyJob = async (formData, idempotencyKey) => {
   console.log(`[API] Submitting application to: ${API_URL}/apply`);
   try {
     const response = await fetch(`${API_URL}/apply`, {
       method: "POST",
+      headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : {},
       body: formData,
     });
 
@@ -62,6 +65,11 @@ export const getApplications = async (filters = {}) => {
 
   if (filters.position) params.append("position", filters.position);
   if (filters.status) params.append("status", filters.status);
+  // Optional keyset pagination / projection: response becomes { items, next_after, has_more, total }.
+  // Without limit/after the server still returns the full list as an array.
+  if (filters.limit) params.append("limit", filters.limit);
+  if (filters.after) params.append("after", filters.after);
+  if (filters.fields) params.append("fields", filters.fields.join(","));
 
   const response = await fetch(`${API_URL}/admin/applications?${params}`, {
     headers: {
@@ -201,7 +209,9 @@ export const viewResume = async (filename) => {
 };
 
 // Download Resume (PROTECTED - Requires token)
-export const downloadResume = async (filename) => {
+// Pass appId so a resume shared by several applications downloads under
+// that application's original file name
+export const downloadResume = async (filename, appId) => {
   const token = getToken();
 
   if (!token) {
@@ -209,7 +219,8 @@ export const downloadResume = async (filename) => {
   }
 
   try {
-    const response = await fetch(`${API_URL}/admin/download-resume/${filename}`, {
+    const query = appId ? `?app_id=${appId}` : "";
+    const response = await fetch(`${API_URL}/admin/download-resume/${filename}${query}`, {
       headers: {
         "Authorization": `Bearer ${token}`,
       },
@@ -259,12 +270,23 @@ export const scheduleInterview = async (interviewData) => {
     },
     body: JSON.stringify(interviewData),
   });
-  if (!response.ok) throw new Error("Failed to schedule interview");
+  if (!response.ok) {
+    // 409 carries the interviewer's overlapping interviews in error.conflicts
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.error || "Failed to schedule interview");
+  }
   return response.json();
 };
 
-export const getInterviews = async () => {
-  const response = await fetch(`${API_URL}/admin/interviews`, {
+// Optional filters: { from, to } (ISO dates, overlapping interviews), interviewer, status
+export const getInterviews = async (filters = {}) => {
+  const params = new URLSearchParams();
+  if (filters.from) params.append("from", filters.from);
+  if (filters.to) params.append("to", filters.to);
+  if (filters.interviewer) params.append("interviewer", filters.interviewer);
+  if (filters.status) params.append("status", filters.status);
+
+  const response = await fetch(`${API_URL}/admin/interviews?${params}`, {
     headers: {
       "Authorization": `Bearer ${getToken()}`,
     },
@@ -273,6 +295,22 @@ export const getInterviews = async () => {
   return response.json();
 };
 
+// Subscribable .ics feed URL (all interviews, or one interviewer's)
+export const getCalendarFeedUrl = async (interviewer) => {
+  const response = await fetch(`${API_URL}/admin/interviews/calendar-token`, {
+    method: "POST",
+    headers: {
+      "Authorization": `Bearer ${getToken()}`,
+    },
+  });
+  if (!response.ok) throw new Error("Failed to create calendar link");
+  const { token } = await response.json();
+  const feed = interviewer
+    ? `calendar/${encodeURIComponent(interviewer)}.ics`
+    : "calendar.ics";
+  return `${API_URL}/admin/interviews/${feed}?token=${encodeURIComponent(token)}`;
+};
+
 export const updateInterviewStatus = async (id, status) => {
   const response = await fetch(`${API_URL}/admin/interviews/${id}`, {
     method: "PUT",
@@ -299,6 +337,11 @@ export const getJobs = async (filters = {}) => {
   if (filters.type) params.append("type", filters.type);
   if (filters.experience) params.append("experience", filters.experience);
   if (filters.status) params.append("status", filters.status);
+  // Server-side ranked search: response becomes { items, page, limit, total }.
+  // Without q the server returns every active job as an array (FindJobs relies on it).
+  if (filters.q) params.append("q", filters.q);
+  if (filters.page) params.append("page", filters.page);
+  if (filters.limit) params.append("limit", filters.limit);
 
   const response = await fetch(`${API_URL}/jobs?${params}`);
 
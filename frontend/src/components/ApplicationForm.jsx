@@ -4,8 +4,13 @@ import {
 } from "lucide-react";
 import { applyJob } from "../api";
 
+const newIdempotencyKey = () =>
+    window.crypto?.randomUUID?.() || `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
 export default function ApplicationForm({ job, onBack, onSuccess }) {
     const [loading, setLoading] = useState(false);
+    // One key per form: retries and double submits replay the same application
+    const [idempotencyKey] = useState(newIdempotencyKey);
     const [error, setError] = useState("");
     const [formData, setFormData] = useState({
         name: "",
@@ -49,7 +54,7 @@ export default function ApplicationForm({ job, onBack, onSuccess }) {
             submitData.append("skills", formData.skills);
             submitData.append("resume", formData.resume);
 
-            await applyJob(submitData);
+            await applyJob(submitData, idempotencyKey);
             onSuccess();
         } catch (err) {
             console.error("Application error:", err);
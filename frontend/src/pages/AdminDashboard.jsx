@@ -273,10 +273,16 @@ function JobFormModal({ job, onClose }) {
   );
 }
 
+// Applications are loaded newest first, one keyset page at a time
+const APPLICATIONS_PAGE_SIZE = 100;
+
 function ApplicationsTab() {
   const [applications, setApplications] = useState([]);
   const [statistics, setStatistics] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [nextAfter, setNextAfter] = useState(null);
+  const [totalApplications, setTotalApplications] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filterPosition, setFilterPosition] = useState("all");
   const [searchTerm, setSearchTerm] = useState("");
   const [selectedApp, setSelectedApp] = useState(null);
@@ -285,15 +291,21 @@ function ApplicationsTab() {
     fetchData();
   }, [filterPosition]);
 
+  const pageFilters = () => ({
+    ...(filterPosition !== 'all' ? { position: filterPosition } : {}),
+    limit: APPLICATIONS_PAGE_SIZE
+  });
+
   const fetchData = async () => {
     setLoading(true);
     try {
-      const filters = filterPosition !== 'all' ? { position: filterPosition } : {};
-      const [appsData, statsData] = await Promise.all([
-        getApplications(filters),
+      const [appsPage, statsData] = await Promise.all([
+        getApplications(pageFilters()),
         getStatistics()
       ]);
-      setApplications(appsData);
+      setApplications(appsPage.items);
+      setNextAfter(appsPage.next_after);
+      setTotalApplications(appsPage.total ?? null);
       setStatistics(statsData);
     } catch (error) {
       console.error("Error fetching data:", error);
@@ -302,6 +314,25 @@ function ApplicationsTab() {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (nextAfter == null) return;
+    setLoadingMore(true);
+    try {
+      const appsPage = await getApplications({ ...pageFilters(), after: nextAfter });
+      setApplications(prev => [...prev, ...appsPage.items]);
+      setNextAfter(appsPage.next_after);
+    } catch (error) {
+      console.error("Error fetching more applications:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const refreshStatistics = async () => {
+    try { setStatistics(await getStatistics()); }
+    catch (error) { console.error("Error fetching statistics:", error); }
+  };
+
   const handleDownloadExcel = async () => {
     try { await downloadAdminExcel(filterPosition); }
     catch (error) { console.error("Export failure:", error); }
@@ -310,7 +341,10 @@ function ApplicationsTab() {
   const handleStatusChange = async (appId, newStatus) => {
     try {
       await updateApplicationStatus(appId, newStatus);
-      await fetchData();
+      // Update in place so pages loaded with "Load more" stay on screen
+      setApplications(prev => prev.map(app => app.ID === appId ? { ...app, Status: newStatus } : app));
+      setSelectedApp(prev => prev && prev.ID === appId ? { ...prev, Status: newStatus } : prev);
+      await refreshStatistics();
     } catch (error) { console.error("Status update failure:", error); }
   };
 
@@ -318,8 +352,10 @@ function ApplicationsTab() {
     if (!window.confirm("Confirm deletion of candidate dossier?")) return;
     try {
       await deleteApplication(appId);
-      await fetchData();
+      setApplications(prev => prev.filter(app => app.ID !== appId));
+      setTotalApplications(prev => prev == null ? prev : prev - 1);
       setSelectedApp(null);
+      await refreshStatistics();
     } catch (error) { console.error("Deletion failure:", error); }
   };
 
@@ -356,7 +392,7 @@ function ApplicationsTab() {
       <div className="flex flex-col md:flex-row md:items-end justify-between gap-6 pb-6 border-b border-gray-100">
         <div>
           <h2 className="text-2xl font-bold text-gray-900 tracking-tight mb-1">Applications</h2>
-          <p className="text-gray-400 font-medium font-sm text-sm">Managing {applications.length} active candidates</p>
+          <p className="text-gray-400 font-medium font-sm text-sm">Managing {totalApplications ?? applications.length} active candidates</p>
         </div>
         <button
           onClick={handleDownloadExcel}
@@ -448,6 +484,21 @@ function ApplicationsTab() {
             </tbody>
           </table>
         </div>
+        {nextAfter != null && (
+          <div className="p-6 border-t border-gray-50 flex items-center justify-between">
+            <p className="text-[10px] font-bold text-gray-400 uppercase tracking-widest">
+              Showing {applications.length}{totalApplications != null ? ` of ${totalApplications}` : ""}
+            </p>
+            <button
+              onClick={handleLoadMore}
+              disabled={loadingMore}
+              className="flex items-center gap-2 px-6 py-3 bg-white border-2 border-gray-100 rounded-xl text-[10px] font-bold uppercase tracking-widest text-gray-900 hover:border-indigo-600 transition-all shadow-sm disabled:opacity-50"
+            >
+              {loadingMore ? <RefreshCw className="w-4 h-4 animate-spin" /> : <ChevronDown className="w-4 h-4" />}
+              Load more
+            </button>
+          </div>
+        )}
       </div>
 
       {selectedApp && (